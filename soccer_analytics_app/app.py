@@ -1,20 +1,10 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-from mplsoccer import Pitch
-import matplotlib.pyplot as plt
-import seaborn as sns
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib import colors
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.application import MIMEApplication
-import io
-import numpy as np
 from datetime import datetime
+from utils.render_cache import render_cache
+from utils.instrumentation import span
+
+# Heavy modules (ReportLab, mplsoccer, SMTP outbox) are imported inside the code paths that use them
 
 # App title
 st.title("Coach's Soccer Analysis App: PDF Export")
@@ -37,142 +27,19 @@ st.markdown("""
 if 'match_data' not in st.session_state:
     st.session_state.match_data = {}
 
-# Generate heatmap
-def generate_heatmap(positions):
-    pitch = Pitch(pitch_color='grass', line_color='white')
-    fig, ax = pitch.draw()
-    if positions:
-        x, y = [], []
-        for pos in positions.split(";"):
-            try:
-                _, xy = pos.split(":")
-                x_val, y_val = map(float, xy.split(","))
-                x.append(x_val)
-                y.append(y_val)
-            except:
-                pass
-        if x:
-            sns.kdeplot(x=x, y=y, fill=True, cmap='viridis', alpha=0.5, ax=ax)
-    return fig
-
-# Generate PDF report
-def generate_pdf_report(match_data):
-    pdf_path = "match_report.pdf"
-    doc = SimpleDocTemplate(pdf_path, pagesize=letter)
-    styles = getSampleStyleSheet()
-    elements = []
-
-    elements.append(Paragraph("Match Report", styles['Title']))
-    elements.append(Spacer(1, 12))
-    elements.append(Paragraph(f"Timestamp: {match_data['Timestamp']}", styles['Normal']))
-    elements.append(Paragraph(f"Date: {match_data['Date']}", styles['Normal']))
-    elements.append(Paragraph(f"Opponent: {match_data['Opponent']}", styles['Normal']))
-    elements.append(Paragraph(f"Score: {match_data['Our Score']} - {match_data['Opponent Score']}", styles['Normal']))
-    elements.append(Spacer(1, 12))
-
-    elements.append(Paragraph("Match Summary", styles['Heading2']))
-    elements.append(Paragraph(f"Key Moments: {match_data['Notes']}", styles['Normal']))
-    elements.append(Spacer(1, 12))
-
-    # Calculate success rates
-    tackle_success = (match_data['Tackles Successful'] / match_data['Tackles Attempted'] * 100) if match_data['Tackles Attempted'] > 0 else 0
-    dribble_success = (match_data['Dribbles Successful'] / match_data['Dribbles Attempted'] * 100) if match_data['Dribbles Attempted'] > 0 else 0
-    cross_success = (match_data['Crosses Successful'] / match_data['Crosses Attempted'] * 100) if match_data['Crosses Attempted'] > 0 else 0
-
-    elements.append(Paragraph("Team Performance", styles['Heading2']))
-    team_data = [
-        ["Metric", "Our Team", "Opponent"],
-        ["Possession (%)", f"{match_data['Possession (%)']}", f"{100 - match_data['Possession (%)']}"],
-        ["Shots (On Target/Total)", f"{match_data['Shots on Target']}/{match_data['Shots']}", "-"],
-        ["Passes (Completed/Attempted)", f"{match_data['Passes Completed']}/{match_data['Passes Attempted']}", "-"],
-        ["Pass Completion (%)", f"{match_data['Pass Completion (%)']:.1f}", "-"],
-        ["Tackles (Successful/Attempted)", f"{match_data['Tackles Successful']}/{match_data['Tackles Attempted']}", "-"],
-        ["Tackle Success (%)", f"{tackle_success:.1f}", "-"],
-        ["Dribbles (Successful/Attempted)", f"{match_data['Dribbles Successful']}/{match_data['Dribbles Attempted']}", "-"],
-        ["Dribble Success (%)", f"{dribble_success:.1f}", "-"],
-        ["Crosses (Successful/Attempted)", f"{match_data['Crosses Successful']}/{match_data['Crosses Attempted']}", "-"],
-        ["Cross Success (%)", f"{cross_success:.1f}", "-"],
-        ["Expected Goals (xG)", f"{match_data['Expected Goals (xG)']:.1f}", f"{match_data['Opponent Expected Goals (xG)']:.1f}"],
-        ["Field Tilt (%)", f"{match_data['Field Tilt (%)']}", f"{100 - match_data['Field Tilt (%)']}"],
-        ["PPDA", f"{match_data['PPDA']}", "-"],
-        ["Set Pieces", f"{match_data['Set Piece Outcomes']}", "-"]
-    ]
-    table = Table(team_data)
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    elements.append(table)
-    elements.append(Spacer(1, 12))
-
-    elements.append(Paragraph("Player Performance", styles['Heading2']))
-    player_data = [
-        ["Metric", "Value"],
-        ["Goals", match_data['Player Goals']],
-        ["Assists", match_data['Player Assists']],
-        ["Shot-Creating Actions (SCA)", match_data['Shot-Creating Actions (SCA)']],
-        ["Goal-Creating Actions (GCA)", match_data['Goal-Creating Actions (GCA)']],
-        ["Expected Assists (xA)", f"{match_data['Expected Assists (xA)']:.1f}"],
-        ["HMLD (km)", f"{match_data['High Metabolic Load Distance (HMLD)']}"],
-        ["Evaluations", match_data.get('Player Evaluations', '')]
-    ]
-    player_table = Table(player_data)
-    player_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    elements.append(player_table)
-    elements.append(Spacer(1, 12))
-
-    elements.append(Paragraph("Tactical Analysis", styles['Heading2']))
-    elements.append(Paragraph(f"Formation: {match_data['Formation']}", styles['Normal']))
-    elements.append(Paragraph(f"Possession Zones: {match_data['Possession Zones']}", styles['Normal']))
-    elements.append(Paragraph(f"Set Pieces: {match_data['Set Piece Outcomes']}", styles['Normal']))
-    elements.append(Paragraph(f"Key Moments: {match_data['Notes']}", styles['Normal']))
-    elements.append(Spacer(1, 12))
-
-    elements.append(Paragraph("Recommendations", styles['Heading2']))
-    recommendations = f"Adjust pressing (PPDA: {match_data['PPDA']}). Focus on {match_data['Possession Zones']}. Improve tackle success ({tackle_success:.1f}%)."
-    elements.append(Paragraph(recommendations, styles['Normal']))
-    elements.append(Spacer(1, 12))
-
-    # Add heatmap
-    heatmap_fig = generate_heatmap(match_data.get("Formation Positions", ""))
-    heatmap_fig.savefig("heatmap.png")
-    elements.append(Paragraph("Player Heatmap", styles['Heading2']))
-    elements.append(Image("heatmap.png", width=400, height=300))
-
-    doc.build(elements)
-    return pdf_path
-
 # Email notification (optional)
-def send_email(subject, body, recipients, pdf_path):
+@st.cache_resource
+def get_outbox():
+    from utils.email_outbox import EmailOutbox
+    return EmailOutbox("smtp.gmail.com", 465, st.secrets["email"]["sender"], st.secrets["email"]["password"])
+
+def send_email(subject, body, recipients, pdf_bytes):
+    # Queued for the background worker so the form returns immediately
     try:
-        msg = MIMEMultipart()
-        msg['Subject'] = subject
-        msg['From'] = st.secrets["email"]["sender"]
-        msg['To'] = ", ".join(recipients)
-        msg.attach(MIMEText(body, 'plain'))
-        with open(pdf_path, "rb") as f:
-            part = MIMEApplication(f.read(), Name="match_report.pdf")
-            part['Content-Disposition'] = 'attachment; filename="match_report.pdf"'
-            msg.attach(part)
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-            server.login(st.secrets["email"]["sender"], st.secrets["email"]["password"])
-            server.sendmail(st.secrets["email"]["sender"], recipients, msg.as_string())
-        st.success("Email sent!")
+        with span("email.enqueue"):
+            message_id = get_outbox().send(subject, body, recipients, [("match_report.pdf", pdf_bytes)])
+        st.session_state.setdefault("email_ids", []).append(message_id)
+        st.info("Email queued for delivery.")
     except Exception as e:
         st.error(f"Email failed: {e}")
 
@@ -246,6 +113,7 @@ with st.form("match_form"):
     possession_zones = st.text_input("Possession Zones (e.g., Defensive:30%, Midfield:50%, Attacking:20%)")
     opponent_xg = st.number_input("Opponent Expected Goals (xG)", min_value=0.0, step=0.1)
     set_piece_outcomes = st.text_input("Set Piece Outcomes (e.g., Corner:Goal, Free Kick:Shot)")
+    events_file = st.file_uploader("Tagged Events CSV (optional, computes xT and Possession Zones)", type="csv")
 
     # Player stats
     st.write("**Player Stats**")
@@ -266,18 +134,30 @@ with st.form("match_form"):
     submitted = st.form_submit_button("Generate Report")
 
     if submitted:
-        if shots_on_target > shots:
-            st.error("Shots on target cannot exceed total shots.")
-        elif passes_completed > passes_attempted:
-            st.error("Passes completed cannot exceed passes attempted.")
-        elif tackles_successful > tackles_attempted:
-            st.error("Successful tackles cannot exceed attempted tackles.")
-        elif dribbles_successful > dribbles_attempted:
-            st.error("Successful dribbles cannot exceed attempted dribbles.")
-        elif crosses_successful > crosses_attempted:
-            st.error("Successful crosses cannot exceed attempted crosses.")
+        with span("report.validate"):
+            checks = [
+                (shots_on_target > shots, "Shots on target cannot exceed total shots."),
+                (passes_completed > passes_attempted, "Passes completed cannot exceed passes attempted."),
+                (tackles_successful > tackles_attempted, "Successful tackles cannot exceed attempted tackles."),
+                (dribbles_successful > dribbles_attempted, "Successful dribbles cannot exceed attempted dribbles."),
+                (crosses_successful > crosses_attempted, "Successful crosses cannot exceed attempted crosses."),
+            ]
+            errors = [message for failed, message in checks if failed]
+        if errors:
+            st.error(errors[0])
         else:
             pass_completion = (passes_completed / passes_attempted * 100) if passes_attempted > 0 else 0
+            if events_file is not None:
+                from utils.expected_threat import event_metrics
+                try:
+                    computed = event_metrics(pd.read_csv(events_file))
+                except Exception as e:
+                    st.error(f"Could not use the tagged events CSV, keeping the entered values: {e}")
+                else:
+                    xt = computed["Expected Threat (xT)"]
+                    if computed["Field Tilt (%)"] is not None:
+                        field_tilt = computed["Field Tilt (%)"]
+                    possession_zones = computed["Possession Zones"]
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             match_data = {
                 "Timestamp": timestamp,
@@ -329,38 +209,115 @@ with st.form("match_form"):
                 "Set Piece Outcomes": set_piece_outcomes,
                 "Tackles Successful": tackles_successful,
                 "Tackles Attempted": tackles_attempted,
-                "Dribbles Successful": dribbles_success,
+                "Dribbles Successful": dribbles_successful,
                 "Dribbles Attempted": dribbles_attempted,
                 "Crosses Successful": crosses_successful,
                 "Crosses Attempted": crosses_attempted,
                 "Formation Positions": formation_positions,
                 "Player Evaluations": player_evals
             }
+            # An unchanged resubmit keeps the earlier Timestamp, so the cached PDF is reused instead of re-rendered
+            previous = st.session_state.match_data
+            if previous and {k: v for k, v in previous.items() if k != "Timestamp"} == \
+                    {k: v for k, v in match_data.items() if k != "Timestamp"}:
+                timestamp = match_data["Timestamp"] = previous["Timestamp"]
             st.session_state.match_data = match_data
 
             # Generate PDF
-            pdf_path = generate_pdf_report(match_data)
-            with open(pdf_path, "rb") as f:
-                st.download_button(
-                    label="Download Match Report PDF",
-                    data=f,
-                    file_name="match_report.pdf",
-                    mime="application/pdf"
-                )
-
-            # CSV download
-            df = pd.DataFrame([match_data])
-            csv = df.to_csv(index=False)
-            st.download_button(
-                label="Download Match Data as CSV",
-                data=csv,
-                file_name="match_data.csv",
-                mime="text/csv"
-            )
+            from utils.match_report import render_pdf_report
+            from utils.coordinates import parse_positions, malformed_report
+            bad_positions = parse_positions(formation_positions).malformed
+            if bad_positions:
+                st.warning(f"Formation Positions: {malformed_report(bad_positions)}")
+            from contextlib import nullcontext
+            from utils.instrumentation import profile
+            with (profile() if st.session_state.get("profile_next") else nullcontext({})) as profiled:
+                pdf_bytes = render_pdf_report(match_data)
+            if "text" in profiled:
+                st.session_state.profile_text = profiled["text"]
+                st.session_state.profile_next = False
+            # Only a match whose report rendered is added to the history and season totals
+            from utils.match_history_manager import record_match
+            from utils.season_aggregates import add_match
+            record_match(match_data)
+            add_match(match_data)
+            # Downloads and email live outside the form; the bytes are kept in session state for them
+            st.session_state.report_pdf = pdf_bytes
+            st.session_state.report_csv = pd.DataFrame([match_data]).to_csv(index=False)
 
             # Email report (optional)
             if email_recipients:
                 body = f"Match Summary\nTimestamp: {timestamp}\nDate: {date}\nOpponent: {opponent}\nScore: {our_score}-{opponent_score}\nNotes: {notes}"
-                send_email("Match Report", body, email_recipients.split(","), pdf_path)
+                st.session_state.pending_email = ("Match Report", body, email_recipients.split(","))
 
             st.success("Report generated successfully!")
+
+if st.session_state.get("report_pdf"):
+    st.download_button(
+        label="Download Match Report PDF",
+        data=st.session_state.report_pdf,
+        file_name="match_report.pdf",
+        mime="application/pdf"
+    )
+
+    # CSV download
+    st.download_button(
+        label="Download Match Data as CSV",
+        data=st.session_state.report_csv,
+        file_name="match_data.csv",
+        mime="text/csv"
+    )
+
+if st.session_state.get("pending_email"):
+    subject, body, recipients = st.session_state.pop("pending_email")
+    send_email(subject, body, recipients, st.session_state.report_pdf)
+
+if st.session_state.get("email_ids"):
+    with st.expander("Email delivery"):
+        outbox = get_outbox()
+        for message_id in st.session_state.email_ids:
+            st.write(f"{message_id[:8]}: {outbox.status.get(message_id, 'unknown')}")
+
+with st.expander("Match history"):
+    from utils.match_history_manager import query_matches, rescan_reports, unmatched_reports
+    # Picks up report files added outside the app; a no-op while output/reports is unchanged
+    rescan_reports()
+    history_page = st.number_input("Page", min_value=1, step=1, key="history_page")
+    history = query_matches(limit=20, offset=(history_page - 1) * 20)
+    if history:
+        st.dataframe(pd.DataFrame(history)[["date", "opponent", "venue", "our_score", "opponent_score", "xg", "files"]])
+    unmatched = unmatched_reports()
+    if unmatched:
+        st.caption("Reports not linked to a recorded match")
+        st.dataframe(pd.DataFrame(unmatched)[["name", "size"]])
+
+with st.expander("Season trends"):
+    from utils.season_aggregates import load_state, season_trends, player_totals, season_focus
+    season_state = load_state()
+    st.json(season_trends(season_state))
+    if season_state["players"]:
+        st.dataframe(pd.DataFrame.from_dict(player_totals(season_state), orient="index"))
+    for focus in season_focus(season_state):
+        st.write(f"- {focus}")
+
+with st.expander("Render cache"):
+    st.json(render_cache.stats())
+
+with st.expander("Debug: stage timings"):
+    from utils import instrumentation
+    # Timings are process-wide, so the UI can switch them on but never off under another session
+    if instrumentation.is_enabled():
+        st.caption("Stage timings are being recorded for this server process.")
+    elif st.button("Record stage timings"):
+        instrumentation.enable()
+        st.rerun()
+    st.checkbox("Profile next report with cProfile", key="profile_next")
+    stage_stats, counters = instrumentation.stats()
+    if stage_stats:
+        st.dataframe(pd.DataFrame.from_dict(stage_stats, orient="index"))
+    if counters:
+        st.json(counters)
+    st.download_button("Download spans (JSON lines)", instrumentation.to_jsonl(), file_name="spans.jsonl")
+    st.download_button("Download Prometheus metrics", instrumentation.to_prometheus(), file_name="metrics.prom")
+    if st.session_state.get("profile_text"):
+        st.code(st.session_state.profile_text)
@@ -0,0 +1,135 @@
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import pandas as pd
+
+# Benchmarks over synthetic matches with tracked baselines: python -m utils.benchmark_suite [--update-baseline]
+BASELINE_PATH = "benchmarks/baseline.json"
+TOLERANCE = 0.25
+# Changes smaller than this are timer noise, not regressions
+MIN_DELTA = 0.005
+
+
+def _cases(events, df, record, workdir):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from utils.csv_event_loader import load_event_csv
+    from utils.player_report import generate_player_report, generate_squad_reports
+    from utils.heatmap import plot_heatmap, density_grids
+    from utils.xg_model import calculate_xg, xg_batch
+    from utils.match_summary import generate_summary
+    from utils.pdf_export import generate_pdf_report as export_pdf
+    from utils.ppt_export import generate_powerpoint_summary, generate_powerpoint_deck
+    from utils.scouting_report import generate_scouting_report
+    from utils.match_report import _build_pdf_report
+
+    csv_path = os.path.join(workdir, "events.csv")
+    df.to_csv(csv_path, index=False)
+    players = list(df["Player"].unique())
+    scored = [dict(e, xG=calculate_xg(e)) for e in events]
+
+    def heatmaps():
+        for player in players:
+            fig = plot_heatmap(df, player)
+            if fig is not None:
+                plt.close(fig)
+
+    return {
+        "load_event_csv": lambda: load_event_csv(csv_path),
+        "generate_player_report (squad)": lambda: [generate_player_report(df, p) for p in players],
+        "generate_squad_reports (indexed)": lambda: generate_squad_reports(df),
+        "plot_heatmap (squad, KDE)": heatmaps,
+        "density_grids (squad)": lambda: density_grids(df),
+        "calculate_xg (per dict)": lambda: [calculate_xg(e) for e in events],
+        "xg_batch": lambda: xg_batch(df),
+        "generate_summary": lambda: generate_summary(scored),
+        "pdf_export.generate_pdf_report": lambda: export_pdf(events, os.path.join(workdir, "r.pdf"), use_cache=False),
+        "scouting_report": lambda: generate_scouting_report(events, os.path.join(workdir, "s.pdf")),
+        "ppt_export.generate_powerpoint_summary": lambda: generate_powerpoint_summary(
+            events, os.path.join(workdir, "s.pptx"), use_cache=False),
+        "ppt_export.generate_powerpoint_deck": lambda: generate_powerpoint_deck(events, os.path.join(workdir, "d.pptx")),
+        "match_report.generate_pdf_report": lambda: _build_pdf_report(record),
+    }
+
+
+def measure(fn, repeats=3):
+    # Best-of-N wall time, then one extra run under tracemalloc for the allocation peak
+    times = []
+    for _ in range(repeats):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": min(times), "peak_mb": peak / 1e6}
+
+
+def run_suite(events_per_match=1800, seed=0, repeats=3, only=None):
+    from utils.synthetic_match import generate_match, generate_match_record
+    from utils.render_cache import render_cache
+    events = generate_match(seed, events_per_match=events_per_match)
+    df = pd.DataFrame(events)
+    record = generate_match_record(seed, events)
+    results = {}
+    # The render cache is bypassed so every run measures a real render and nothing is written to output/cache
+    with tempfile.TemporaryDirectory() as workdir, render_cache.bypassed():
+        for name, fn in _cases(events, df, record, workdir).items():
+            if only and not any(key in name for key in only):
+                continue
+            results[name] = measure(fn, repeats)
+    return {"events_per_match": events_per_match, "seed": seed, "results": results}
+
+
+def compare(report, baseline, tolerance=TOLERANCE, min_delta=MIN_DELTA):
+    regressions = []
+    for name, current in report["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if (previous and current["seconds"] > previous["seconds"] * (1 + tolerance)
+                and current["seconds"] - previous["seconds"] > min_delta):
+            regressions.append((name, previous["seconds"], current["seconds"]))
+    return regressions
+
+
+def format_report(report, baseline=None):
+    lines = [f"{'benchmark':45} {'seconds':>10} {'peak MB':>9} {'baseline':>10}"]
+    for name, r in report["results"].items():
+        base = (baseline or {}).get("results", {}).get(name, {}).get("seconds")
+        base_text = f"{base:10.4f}" if base is not None else f"{'-':>10}"
+        lines.append(f"{name:45} {r['seconds']:10.4f} {r['peak_mb']:9.1f} {base_text}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark the utils pipeline on synthetic matches")
+    parser.add_argument("--events", type=int, default=1800)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--only", nargs="*")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    report = run_suite(args.events, repeats=args.repeats, only=args.only)
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print(format_report(report, baseline))
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+    elif baseline:
+        regressions = compare(report, baseline)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: {before:.4f}s -> {after:.4f}s")
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,82 @@
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+
+# One place to turn coordinate strings into float32 arrays, plus converters between pitch spaces
+PITCH_SPACES = {
+    "canvas": (400.0, 300.0),     # tagging canvas used by heatmap, xG and xT
+    "statsbomb": (120.0, 80.0),   # mplsoccer's default Pitch
+    "metres": (105.0, 68.0),
+    "normalized": (1.0, 1.0),
+}
+
+ParsedCoordinates = namedtuple("ParsedCoordinates", ["x", "y", "malformed"])
+ParsedPositions = namedtuple("ParsedPositions", ["players", "x", "y", "malformed"])
+
+
+def parse_locations(values):
+    # "x,y" strings -> float32 x, y (NaN where missing); malformed is a list of (row label, raw value)
+    s = values if isinstance(values, pd.Series) else pd.Series(values, dtype="object")
+    s = s.astype("string")
+    # A fixed two-group extract always yields columns 0 and 1, even for an empty Series
+    parts = s.str.extract(r"^([^,]*)(?:,(.*))?$", expand=True)
+    x = pd.to_numeric(parts[0].str.strip(), errors="coerce")
+    y = pd.to_numeric(parts[1].str.strip(), errors="coerce")
+    bad = s.notna() & (s.str.strip() != "") & (x.isna() | y.isna())
+    malformed = list(zip(s.index[bad], s[bad]))
+    x = x.where(~bad).to_numpy(np.float32, na_value=np.nan)
+    y = y.where(~bad).to_numpy(np.float32, na_value=np.nan)
+    return ParsedCoordinates(x, y, malformed)
+
+
+def parse_positions(text):
+    # "Player1:ST,10,20;Player2:30,40" -> names and float32 x, y; an optional role before x,y is ignored
+    entries = [entry.strip() for entry in str(text or "").split(";") if entry.strip()]
+    players, xs, ys, malformed = [], [], [], []
+    for i, entry in enumerate(entries):
+        name, sep, rest = entry.partition(":")
+        fields = [f.strip() for f in rest.split(",")]
+        try:
+            if not sep or len(fields) < 2:
+                raise ValueError
+            x_val, y_val = float(fields[-2]), float(fields[-1])
+        except ValueError:
+            malformed.append((i, entry))
+            continue
+        players.append(name.strip())
+        xs.append(x_val)
+        ys.append(y_val)
+    return ParsedPositions(players, np.array(xs, np.float32), np.array(ys, np.float32), malformed)
+
+
+def event_xy(events_df, space="canvas", column="Location"):
+    # Reuses X/Y columns (event store) when present, otherwise parses the Location strings once
+    if "X" in events_df.columns and "Y" in events_df.columns:
+        x, y = events_df["X"].to_numpy(np.float32), events_df["Y"].to_numpy(np.float32)
+    else:
+        x, y, _ = parse_locations(events_df[column])
+    if space != "canvas":
+        x, y = convert(x, y, "canvas", space)
+    return x, y
+
+
+def to_normalized(x, y, space="canvas"):
+    width, height = PITCH_SPACES[space]
+    return np.asarray(x, np.float32) / np.float32(width), np.asarray(y, np.float32) / np.float32(height)
+
+
+def from_normalized(x, y, space="canvas"):
+    width, height = PITCH_SPACES[space]
+    return np.asarray(x, np.float32) * np.float32(width), np.asarray(y, np.float32) * np.float32(height)
+
+
+def convert(x, y, source, target):
+    return from_normalized(*to_normalized(x, y, source), target)
+
+
+def malformed_report(malformed, limit=10):
+    if not malformed:
+        return ""
+    shown = ", ".join(f"{row}: {value!r}" for row, value in malformed[:limit])
+    more = f" (+{len(malformed) - limit} more)" if len(malformed) > limit else ""
+    return f"{len(malformed)} malformed coordinate(s): {shown}{more}"
@@ -0,0 +1,182 @@
+import heapq
+import json
+import os
+import queue
+import smtplib
+import threading
+import time
+import uuid
+from email import message_from_bytes
+from email.mime.application import MIMEApplication
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from utils.instrumentation import count, span
+
+# Background email outbox: one worker thread, one reused SMTP login, failed messages kept on disk
+OUTBOX_DIR = "output/outbox"
+
+
+def build_message(subject, body, sender, attachments=()):
+    msg = MIMEMultipart()
+    msg['Subject'] = subject
+    msg['From'] = sender
+    msg.attach(MIMEText(body, 'plain'))
+    for name, data in attachments:
+        part = MIMEApplication(data, Name=name)
+        part['Content-Disposition'] = f'attachment; filename="{name}"'
+        msg.attach(part)
+    return msg
+
+
+class EmailOutbox:
+    def __init__(self, host, port, sender, password=None, username=None, use_ssl=True,
+                 outbox_dir=OUTBOX_DIR, batch_size=50, max_retries=3, backoff=2.0, idle_timeout=60.0):
+        self.host, self.port = host, port
+        self.sender = sender
+        self.username = username or sender
+        self.password = password
+        self.use_ssl = use_ssl
+        self.outbox_dir = outbox_dir
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.idle_timeout = idle_timeout
+        self.status = {}
+        self._queue = queue.Queue()
+        # Retries wait here with a not-before time so a failing message never blocks the worker
+        self._delayed = []
+        self._lock = threading.Lock()
+        self._server = None
+        self._worker = threading.Thread(target=self._run, name="email-outbox", daemon=True)
+        self._worker.start()
+
+    def send(self, subject, body, recipients, attachments=()):
+        message_id = uuid.uuid4().hex
+        recipients = [r.strip() for r in recipients if r.strip()]
+        msg = build_message(subject, body, self.sender, attachments)
+        self.status[message_id] = "queued"
+        self._queue.put((message_id, msg, recipients, 0))
+        return message_id
+
+    def _connect(self):
+        if self._server is not None:
+            try:
+                self._server.noop()
+                return self._server
+            except smtplib.SMTPException:
+                self._disconnect()
+        smtp_class = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+        with span("email.smtp_connect"):
+            self._server = smtp_class(self.host, self.port, timeout=30)
+            if self.password:
+                self._server.login(self.username, self.password)
+        return self._server
+
+    def _disconnect(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._server = None
+
+    def _deliver(self, msg, recipients, delivered):
+        server = self._connect()
+        # One SMTP transaction per batch of recipients instead of one login per report
+        for i in range(0, len(recipients), self.batch_size):
+            batch = recipients[i:i + self.batch_size]
+            del msg['To']
+            msg['To'] = ", ".join(batch)
+            with span("email.smtp_send"):
+                server.sendmail(self.sender, batch, msg.as_string())
+            delivered.extend(batch)
+            count("email.recipients", len(batch))
+
+    def _release_due(self):
+        # Moves retries whose backoff has elapsed onto the queue; returns seconds until the next one
+        with self._lock:
+            now = time.monotonic()
+            while self._delayed and self._delayed[0][0] <= now:
+                self._queue.put(heapq.heappop(self._delayed)[2])
+            return self._delayed[0][0] - now if self._delayed else None
+
+    def _run(self):
+        while True:
+            next_due = self._release_due()
+            timeout = self.idle_timeout if next_due is None else min(next_due, self.idle_timeout)
+            try:
+                message_id, msg, recipients, attempt = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                if next_due is None:
+                    self._disconnect()
+                continue
+            if message_id is None:
+                self._disconnect()
+                self._save_delayed()
+                self._queue.task_done()
+                return
+            delivered = []
+            try:
+                self._deliver(msg, recipients, delivered)
+                self.status[message_id] = "sent"
+            except (smtplib.SMTPException, OSError) as e:
+                self._disconnect()
+                # Only recipients whose batch did not go through are retried
+                remaining = recipients[len(delivered):]
+                if attempt + 1 < self.max_retries:
+                    self.status[message_id] = f"retrying ({e})"
+                    with self._lock:
+                        heapq.heappush(self._delayed, (time.monotonic() + self.backoff * 2 ** attempt, message_id,
+                                                       (message_id, msg, remaining, attempt + 1)))
+                else:
+                    self._save_failed(message_id, msg, remaining, e)
+                    self.status[message_id] = f"failed ({e})"
+            finally:
+                self._queue.task_done()
+
+    def _save_delayed(self):
+        with self._lock:
+            delayed, self._delayed = self._delayed, []
+        for _, message_id, (_, msg, recipients, _) in delayed:
+            self._save_failed(message_id, msg, recipients, "outbox closed before retry")
+            self.status[message_id] = "failed (outbox closed before retry)"
+
+    def _save_failed(self, message_id, msg, recipients, error):
+        os.makedirs(self.outbox_dir, exist_ok=True)
+        with open(os.path.join(self.outbox_dir, f"{message_id}.eml"), "wb") as f:
+            f.write(msg.as_bytes())
+        with open(os.path.join(self.outbox_dir, f"{message_id}.json"), "w") as f:
+            json.dump({"recipients": recipients, "error": str(error)}, f)
+
+    def retry_failed(self):
+        if not os.path.isdir(self.outbox_dir):
+            return []
+        requeued = []
+        for name in os.listdir(self.outbox_dir):
+            if not name.endswith(".json"):
+                continue
+            message_id = name[:-5]
+            eml_path = os.path.join(self.outbox_dir, f"{message_id}.eml")
+            with open(os.path.join(self.outbox_dir, name)) as f:
+                recipients = json.load(f)["recipients"]
+            with open(eml_path, "rb") as f:
+                msg = message_from_bytes(f.read())
+            os.remove(eml_path)
+            os.remove(os.path.join(self.outbox_dir, name))
+            self.status[message_id] = "queued"
+            self._queue.put((message_id, msg, recipients, 0))
+            requeued.append(message_id)
+        return requeued
+
+    def flush(self):
+        while True:
+            self._queue.join()
+            with self._lock:
+                next_due = self._delayed[0][0] - time.monotonic() if self._delayed else None
+            if next_due is None:
+                return
+            time.sleep(max(next_due, 0.01))
+
+    def close(self):
+        self._queue.put((None, None, None, 0))
+        self._worker.join()
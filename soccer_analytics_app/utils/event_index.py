@@ -0,0 +1,48 @@
+import numpy as np
+
+# Event frame wrapper with row indexes built once, so per-player slices cost O(k) instead of a full mask
+class IndexedEvents:
+    def __init__(self, df):
+        self.df = df.reset_index(drop=True)
+        self._players = self._build_index("Player")
+        self._event_types = self._build_index("Event Type")
+        self._type_counts = None
+
+    def _build_index(self, column):
+        if column not in self.df.columns:
+            return {}
+        return self.df.groupby(column, observed=True, sort=False).indices
+
+    def __len__(self):
+        return len(self.df)
+
+    @property
+    def players(self):
+        return list(self._players)
+
+    @property
+    def event_types(self):
+        return list(self._event_types)
+
+    def player_rows(self, player_name):
+        return self._players.get(player_name, np.empty(0, dtype=np.intp))
+
+    def player(self, player_name):
+        return self.df.take(self.player_rows(player_name))
+
+    def event_type(self, event_type):
+        return self.df.take(self._event_types.get(event_type, np.empty(0, dtype=np.intp)))
+
+    def event_type_counts(self):
+        # Squad-wide Player x Event Type table from a single groupby
+        if self._type_counts is None:
+            self._type_counts = (
+                self.df.groupby(["Player", "Event Type"], observed=True)
+                .size()
+                .rename("Count")
+            )
+        return self._type_counts
+
+
+def index_events(events_df):
+    return events_df if isinstance(events_df, IndexedEvents) else IndexedEvents(events_df)
@@ -0,0 +1,86 @@
+import json
+import os
+import time
+import pandas as pd
+
+# Append-only JSON-lines journal for live tagging; one line per event, fsync batched
+JOURNAL_PATH = "output/reports/tagged_events.journal"
+
+class EventJournal:
+    def __init__(self, path=JOURNAL_PATH, sync_every=20, sync_interval=2.0):
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.events, end = _read_journal(path)
+        self._truncate_torn_tail(end)
+        self._file = open(path, "a", encoding="utf-8")
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def _truncate_torn_tail(self, end):
+        # A crash mid-append can leave a partial last line; cut the file back to the last recovered record
+        if os.path.exists(self.path) and os.path.getsize(self.path) != end:
+            with open(self.path, "rb+") as f:
+                f.truncate(end)
+
+    def append(self, event):
+        self._file.write(json.dumps(event, default=str) + "\n")
+        self.events.append(event)
+        self._pending += 1
+        if self._pending >= self.sync_every or time.monotonic() - self._last_sync >= self.sync_interval:
+            self.sync()
+        return event
+
+    def sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def compact(self, filepath="output/reports/tagged_events.csv", match_id=None):
+        from utils.tagging import save_events
+        self.sync()
+        if match_id is not None:
+            result = save_events(self.events, match_id=match_id)
+        else:
+            # Write next to the target and rename so a crash never leaves a half-written match file
+            tmp_path = filepath + ".tmp"
+            pd.DataFrame(self.events).to_csv(tmp_path, index=False)
+            os.replace(tmp_path, filepath)
+            result = filepath
+        self.close()
+        os.remove(self.path)
+        return result
+
+    def close(self):
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _read_journal(path):
+    # Only newline-terminated records count; returns the events and the byte offset just past the last one
+    events, end = [], 0
+    if not os.path.exists(path):
+        return events, end
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                events.append(json.loads(line))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                break
+            end += len(line)
+    return events, end
+
+
+def recover_events(path=JOURNAL_PATH):
+    return _read_journal(path)[0]
@@ -0,0 +1,82 @@
+# Fuse AI, YOLO and Whisper event lists that describe the same moment
+DEFAULT_PRIORITY = ["manual", "whisper", "yolo", "ai"]
+DEFAULT_TOLERANCE = 3.0
+# Event types from different detectors that refer to the same kind of moment
+MATCH_ALIASES = {"xG Moment": "Shot"}
+
+FIELDS = ["Event Type", "Timestamp", "Player", "Location", "Notes"]
+
+
+def _player(event):
+    player = event.get("Player")
+    return None if player in (None, "") else str(player)
+
+
+def _fuse(cluster, rank):
+    cluster.sort(key=lambda item: rank(item[0]))
+    merged = dict(cluster[0][1])
+    for _, event in cluster[1:]:
+        for field in FIELDS:
+            if merged.get(field) in (None, "") and event.get(field) not in (None, ""):
+                merged[field] = event[field]
+    merged["Sources"] = ",".join(dict.fromkeys(source for source, _ in cluster))
+    return merged
+
+
+def _joins(cluster, source, player, match_player):
+    # A cluster holds at most one event per source; players must agree when both sides name one
+    if source in cluster["sources"]:
+        return False
+    return not (match_player and player and cluster["player"] and player != cluster["player"])
+
+
+def merge_events(sources, tolerance=DEFAULT_TOLERANCE, priority=DEFAULT_PRIORITY,
+                 aliases=MATCH_ALIASES, match_player=True):
+    # sources: {"whisper": [...], "yolo": [...], "ai": [...]}; tolerance: seconds, or {event type: seconds}
+    order = {name: i for i, name in enumerate(priority)}
+    rank = lambda source: order.get(source, len(order))
+    window = (lambda kind: tolerance.get(kind, DEFAULT_TOLERANCE)) if isinstance(tolerance, dict) else (lambda kind: tolerance)
+
+    tagged = [
+        (aliases.get(event.get("Event Type"), event.get("Event Type")), float(event["Timestamp"]), source, event)
+        for source, events in sources.items()
+        for event in events
+    ]
+    # One sort puts every candidate duplicate next to each other; only clusters still inside the window stay open
+    tagged.sort(key=lambda item: (str(item[0]), item[1], rank(item[2])))
+
+    clusters, open_clusters, open_kind = [], [], None
+    for kind, ts, source, event in tagged:
+        if kind != open_kind:
+            open_clusters, open_kind = [], kind
+        open_clusters = [c for c in open_clusters if ts - c["start"] <= window(kind)]
+        player = _player(event)
+        cluster = next((c for c in open_clusters if _joins(c, source, player, match_player)), None)
+        if cluster is None:
+            cluster = {"start": ts, "sources": set(), "player": None, "events": []}
+            clusters.append(cluster)
+            open_clusters.append(cluster)
+        cluster["sources"].add(source)
+        cluster["player"] = cluster["player"] or player
+        cluster["events"].append((source, event))
+
+    merged = [_fuse(c["events"], rank) for c in clusters]
+    merged.sort(key=lambda e: float(e["Timestamp"]))
+    return merged
+
+
+def merge_and_save(sources, filepath="output/reports/tagged_events.csv", match_id=None, **merge_kwargs):
+    from utils.tagging import save_events
+    merged = merge_events(sources, **merge_kwargs)
+    save_events(merged, filepath, match_id=match_id)
+    return merged
+
+
+def merge_detectors(video_path, audio_path=None, **merge_kwargs):
+    from utils.ai_tagging import detect_xg_moments
+    from utils.yolo_tagging import detect_with_yolo
+    from utils.whisper_tagging import detect_voice_tags
+    sources = {"ai": detect_xg_moments(video_path), "yolo": detect_with_yolo(video_path)}
+    if audio_path:
+        sources["whisper"] = detect_voice_tags(audio_path)
+    return merge_events(sources, **merge_kwargs)
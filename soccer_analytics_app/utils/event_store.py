@@ -0,0 +1,105 @@
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from utils.coordinates import parse_locations
+
+# Columnar event store: one Parquet partition per match (match_id=<id>/)
+STORE_DIR = "output/event_store"
+
+EVENT_SCHEMA = pa.schema([
+    ("Event Type", pa.dictionary(pa.int32(), pa.string())),
+    ("Timestamp", pa.float64()),
+    ("Player", pa.dictionary(pa.int32(), pa.string())),
+    ("X", pa.float32()),
+    ("Y", pa.float32()),
+    ("Location", pa.string()),
+    ("Notes", pa.string()),
+])
+
+
+def split_location(location):
+    x, y, _ = parse_locations(location)
+    return pd.Series(x, index=location.index), pd.Series(y, index=location.index)
+
+
+def events_to_frame(events):
+    df = events if isinstance(events, pd.DataFrame) else pd.DataFrame(events)
+    df = df.reindex(columns=["Event Type", "Timestamp", "Player", "Location", "Notes"])
+    out = pd.DataFrame({
+        "Event Type": df["Event Type"].astype("string").astype("category"),
+        "Timestamp": pd.to_numeric(df["Timestamp"], errors="coerce").astype("float64"),
+        # Jersey numbers come back from CSV as ints, keep them as labels
+        "Player": df["Player"].astype("string").str.replace(r"\.0$", "", regex=True).astype("category"),
+    })
+    out["X"], out["Y"] = split_location(df["Location"])
+    out["Location"] = df["Location"].astype("string")
+    out["Notes"] = df["Notes"].astype("string")
+    return out
+
+
+def write_match_events(events, match_id, store_dir=STORE_DIR):
+    df = events_to_frame(events).sort_values("Timestamp", kind="stable")
+    part_dir = os.path.join(store_dir, f"match_id={match_id}")
+    os.makedirs(part_dir, exist_ok=True)
+    table = pa.Table.from_pandas(df, schema=EVENT_SCHEMA, preserve_index=False)
+    path = os.path.join(part_dir, "events.parquet")
+    pq.write_table(table, path, row_group_size=8192)
+    return path
+
+
+def import_event_csv(csv_path, match_id, store_dir=STORE_DIR):
+    from utils.csv_event_loader import load_event_csv
+    return write_match_events(load_event_csv(csv_path), match_id, store_dir)
+
+
+def list_matches(store_dir=STORE_DIR):
+    if not os.path.isdir(store_dir):
+        return []
+    return sorted(d.split("=", 1)[1] for d in os.listdir(store_dir) if d.startswith("match_id="))
+
+
+def _filter_expression(players, event_types, time_window):
+    expr = None
+    if players is not None:
+        expr = ds.field("Player").isin([str(p) for p in players])
+    if event_types is not None:
+        cond = ds.field("Event Type").isin(list(event_types))
+        expr = cond if expr is None else expr & cond
+    if time_window is not None:
+        start, end = time_window
+        cond = (ds.field("Timestamp") >= start) & (ds.field("Timestamp") <= end)
+        expr = cond if expr is None else expr & cond
+    return expr
+
+
+def read_events(store_dir=STORE_DIR, match_ids=None, players=None, event_types=None,
+                time_window=None, columns=None):
+    if match_ids is not None:
+        paths = [os.path.join(store_dir, f"match_id={m}", "events.parquet") for m in match_ids]
+        paths = [p for p in paths if os.path.exists(p)]
+    else:
+        paths = [os.path.join(store_dir, f"match_id={m}", "events.parquet") for m in list_matches(store_dir)]
+    if not paths:
+        return events_to_frame([]).assign(match_id=pd.Series(dtype="string"))
+
+    frames = []
+    expr = _filter_expression(players, event_types, time_window)
+    for path in paths:
+        # Memory-map each partition and let Parquet row-group stats skip what the filter excludes
+        table = pq.read_table(path, columns=columns, filters=expr, memory_map=True)
+        match_id = os.path.basename(os.path.dirname(path)).split("=", 1)[1]
+        frames.append(table.to_pandas().assign(match_id=match_id))
+    df = pd.concat(frames, ignore_index=True)
+    for col in ("Event Type", "Player"):
+        if col in df.columns:
+            df[col] = df[col].astype("string").astype("category")
+    df["match_id"] = df["match_id"].astype("category")
+    return df
+
+
+def frame_to_events(df):
+    records = df.drop(columns=[c for c in ("X", "Y", "match_id") if c in df.columns])
+    records = records.astype(object).where(records.notna(), None)
+    return records.to_dict("records")
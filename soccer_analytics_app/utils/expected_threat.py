@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+from utils.coordinates import PITCH_SPACES, event_xy, parse_locations
+
+# Expected Threat (xT) on a zone grid over the 400x300 canvas, attacking towards x = 400
+GRID = (16, 12)
+CANVAS = PITCH_SPACES["canvas"]
+MOVE_TYPES = ("Pass", "Carry", "Dribble", "Cross")
+SHOT_TYPES = ("Shot", "Goal")
+
+_grid_cache = {}
+
+
+def check_columns(events_df):
+    missing = [c for c in ("Event Type",) if c not in events_df.columns]
+    if "Location" not in events_df.columns and not {"X", "Y"} <= set(events_df.columns):
+        missing.append("Location")
+    if missing:
+        raise ValueError(f"Tagged events are missing column(s): {', '.join(missing)}")
+
+
+def event_types(df):
+    # Blank Event Type cells become "" so the comparisons below never meet pd.NA
+    return df["Event Type"].astype("string").fillna("").to_numpy(str)
+
+
+def event_coordinates(events_df):
+    # Start from X/Y (event store) or Location; end from End Location, or else the next event's start
+    df = events_df.sort_values("Timestamp", kind="stable") if "Timestamp" in events_df.columns else events_df
+    x, y = event_xy(df)
+    if "End Location" in df.columns:
+        end_x, end_y, _ = parse_locations(df["End Location"])
+    else:
+        end_x = np.append(x[1:], np.nan)
+        end_y = np.append(y[1:], np.nan)
+    return df, x, y, end_x, end_y
+
+
+def zone_index(x, y, grid=GRID, canvas=CANVAS):
+    nx, ny = grid
+    ix = np.clip((x / canvas[0] * nx).astype(np.int64), 0, nx - 1)
+    iy = np.clip((y / canvas[1] * ny).astype(np.int64), 0, ny - 1)
+    return iy * nx + ix
+
+
+def transition_matrices(events_df, grid=GRID):
+    df, x, y, end_x, end_y = event_coordinates(events_df)
+    n_zones = grid[0] * grid[1]
+    kind = event_types(df)
+    has_start = np.isfinite(x) & np.isfinite(y)
+
+    is_move = np.isin(kind, MOVE_TYPES) & has_start & np.isfinite(end_x) & np.isfinite(end_y)
+    is_shot = np.isin(kind, SHOT_TYPES) & has_start
+    is_goal = (kind == "Goal") & has_start
+
+    start_zone = np.zeros(len(df), dtype=np.int64)
+    start_zone[has_start] = zone_index(x[has_start], y[has_start], grid)
+    end_zone = zone_index(end_x[is_move], end_y[is_move], grid)
+
+    move_counts = np.bincount(start_zone[is_move], minlength=n_zones).astype(float)
+    shot_counts = np.bincount(start_zone[is_shot], minlength=n_zones).astype(float)
+    goal_counts = np.bincount(start_zone[is_goal], minlength=n_zones).astype(float)
+    transitions = np.bincount(start_zone[is_move] * n_zones + end_zone,
+                              minlength=n_zones * n_zones).reshape(n_zones, n_zones).astype(float)
+
+    actions = move_counts + shot_counts
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shoot_prob = np.nan_to_num(shot_counts / actions)
+        move_prob = np.nan_to_num(move_counts / actions)
+        score_prob = np.nan_to_num(goal_counts / shot_counts)
+        transition_prob = np.nan_to_num(transitions / move_counts[:, None])
+    return shoot_prob, move_prob, score_prob, transition_prob
+
+
+def solve_xt(shoot_prob, move_prob, score_prob, transition_prob, tol=1e-6, max_iter=100):
+    xt = np.zeros_like(shoot_prob)
+    for _ in range(max_iter):
+        updated = shoot_prob * score_prob + move_prob * (transition_prob @ xt)
+        if np.abs(updated - xt).max() < tol:
+            return updated
+        xt = updated
+    return xt
+
+
+def _dataset_key(events_df, grid):
+    cols = [c for c in ("Event Type", "Timestamp", "Location", "End Location", "X", "Y") if c in events_df.columns]
+    return grid, int(pd.util.hash_pandas_object(events_df[cols], index=False).sum())
+
+
+def xt_grid(events_df, grid=GRID):
+    # Solved grids are cached per dataset content, so re-valuing the same season skips the solve
+    key = _dataset_key(events_df, grid)
+    if key not in _grid_cache:
+        _grid_cache[key] = solve_xt(*transition_matrices(events_df, grid)).reshape(grid[1], grid[0])
+    return _grid_cache[key]
+
+
+def value_actions(events_df, xt=None, grid=GRID):
+    xt = xt_grid(events_df, grid) if xt is None else xt
+    df, x, y, end_x, end_y = event_coordinates(events_df)
+    kind = event_types(df)
+    valid = np.isin(kind, MOVE_TYPES) & np.isfinite(x) & np.isfinite(y) & np.isfinite(end_x) & np.isfinite(end_y)
+    flat = xt.ravel()
+    values = np.zeros(len(df))
+    values[valid] = (flat[zone_index(end_x[valid], end_y[valid], grid)]
+                     - flat[zone_index(x[valid], y[valid], grid)])
+    return pd.Series(values, index=df.index, name="xT").reindex(events_df.index)
+
+
+def territory_metrics(events_df, team_column="Team", our_team=None):
+    # Field tilt and possession zones come from the same binned pass locations; field tilt compares
+    # both teams' final-third passes, so without team information it is None rather than a different metric
+    df, x, _, _, _ = event_coordinates(events_df)
+    is_pass = (event_types(df) == "Pass") & np.isfinite(x)
+    third = np.minimum((x[is_pass] / CANVAS[0] * 3).astype(np.int64), 2)
+
+    if team_column in df.columns and our_team is not None:
+        ours = (df[team_column].astype("string").fillna("").to_numpy(str) == str(our_team))[is_pass]
+        final_third = third == 2
+        # Opponent passes attack the other way, so their final third is our defensive third
+        opp_final_third = third == 0
+        our_ft = int((ours & final_third).sum())
+        total_ft = our_ft + int((~ours & opp_final_third).sum())
+        zone_counts = np.bincount(third[ours], minlength=3)
+        field_tilt = round(100 * our_ft / total_ft) if total_ft else 0
+    else:
+        zone_counts = np.bincount(third, minlength=3)
+        field_tilt = None
+
+    shares = zone_counts / zone_counts.sum() * 100 if zone_counts.sum() else np.zeros(3)
+    zones = ", ".join(f"{name}:{share:.0f}%" for name, share in zip(("Defensive", "Midfield", "Attacking"), shares))
+    return {"Field Tilt (%)": field_tilt, "Possession Zones": zones}
+
+
+def event_metrics(events_df, xt=None, **territory_kwargs):
+    check_columns(events_df)
+    action_values = value_actions(events_df, xt)
+    metrics = {"Expected Threat (xT)": round(float(action_values.clip(lower=0).sum()), 2)}
+    metrics.update(territory_metrics(events_df, **territory_kwargs))
+    return metrics
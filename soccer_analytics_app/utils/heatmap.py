@@ -1,15 +1,149 @@
+import time
 import matplotlib.pyplot as plt
-import seaborn as sns
 import pandas as pd
+import numpy as np
+from utils.event_index import IndexedEvents
+from utils.coordinates import PITCH_SPACES, event_xy
+
+CANVAS_EXTENT = (0, PITCH_SPACES["canvas"][0], 0, PITCH_SPACES["canvas"][1])
+TEAM_KEY = "__team__"
 
 def plot_heatmap(df, player_name):
-    df_player = df[df["Player"] == player_name]
-    coords = df_player["Location"].dropna().str.extract(r'(\d+),(\d+)').astype(float)
-    if coords.empty:
+    import seaborn as sns
+    if isinstance(df, IndexedEvents):
+        df_player = df.player(player_name)
+    else:
+        df_player = df[df["Player"] == player_name]
+    x, y = event_xy(df_player)
+    valid = np.isfinite(x) & np.isfinite(y)
+    if not valid.any():
         return None
     fig, ax = plt.subplots()
-    sns.kdeplot(x=coords[0], y=coords[1], fill=True, ax=ax, cmap='coolwarm', bw_adjust=0.5)
+    sns.kdeplot(x=x[valid], y=y[valid], fill=True, ax=ax, cmap='coolwarm', bw_adjust=0.5)
     ax.set_title(f"Heatmap for {player_name}")
     ax.set_xlim(0, 400)
     ax.set_ylim(0, 300)
     return fig
+
+
+def _gaussian_matrix(n, sigma):
+    # Dense 1D smoothing operator; applying it along each axis is a separable 2D Gaussian
+    idx = np.arange(n)
+    kernel = np.exp(-0.5 * ((idx[:, None] - idx[None, :]) / sigma) ** 2)
+    return kernel / kernel.sum(axis=1, keepdims=True)
+
+
+def smooth_grids(grids, sigma):
+    if sigma <= 0:
+        return grids
+    ky = _gaussian_matrix(grids.shape[-2], sigma)
+    kx = _gaussian_matrix(grids.shape[-1], sigma)
+    return np.einsum("ij,...jk,lk->...il", ky, grids, kx, optimize=True)
+
+
+def density_grids(df, bins=(40, 30), extent=CANVAS_EXTENT, sigma=1.5, include_team=True):
+    # One histogram pass over the whole frame: grids[p] is (ny, nx) for player code p
+    if isinstance(df, IndexedEvents):
+        df = df.df
+    nx, ny = bins
+    x0, x1, y0, y1 = extent
+    x, y = event_xy(df)
+    players = df["Player"].astype("string").astype("category")
+    names = list(players.cat.categories)
+    codes = players.cat.codes.to_numpy()
+
+    valid = np.isfinite(x) & np.isfinite(y) & (codes >= 0)
+    ix = np.clip(((x[valid] - x0) / (x1 - x0) * nx).astype(np.int64), 0, nx - 1)
+    iy = np.clip(((y[valid] - y0) / (y1 - y0) * ny).astype(np.int64), 0, ny - 1)
+    flat = (codes[valid].astype(np.int64) * ny + iy) * nx + ix
+    counts = np.bincount(flat, minlength=len(names) * ny * nx).astype(np.float64)
+    grids = smooth_grids(counts.reshape(len(names), ny, nx), sigma)
+
+    result = {name: grids[i] for i, name in enumerate(names)}
+    if include_team:
+        result[TEAM_KEY] = grids.sum(axis=0)
+    return result
+
+
+def density_grid(x, y, bins=(40, 30), extent=CANVAS_EXTENT, sigma=1.5):
+    df = pd.DataFrame({"Player": TEAM_KEY, "X": np.asarray(x, float), "Y": np.asarray(y, float)})
+    return density_grids(df, bins, extent, sigma, include_team=False).get(TEAM_KEY, np.zeros(bins[::-1]))
+
+
+def draw_density(grid, ax=None, extent=CANVAS_EXTENT, cmap='coolwarm', alpha=0.7, title=None):
+    own_axes = ax is None
+    if own_axes:
+        fig, ax = plt.subplots()
+    else:
+        fig = ax.figure
+    masked = np.ma.masked_less_equal(grid, grid.max() * 0.02 if grid.size else 0)
+    # A caller's axes (e.g. an mplsoccer pitch) keep their own aspect and limits
+    limits = None if own_axes else (ax.get_xlim(), ax.get_ylim())
+    ax.imshow(masked, extent=extent, origin="lower", cmap=cmap, alpha=alpha,
+              interpolation="bilinear", aspect="auto" if own_axes else None, zorder=2)
+    if title:
+        ax.set_title(title)
+    if own_axes:
+        ax.set_xlim(extent[0], extent[1])
+        ax.set_ylim(extent[2], extent[3])
+    else:
+        ax.set_xlim(*limits[0])
+        ax.set_ylim(*limits[1])
+    return fig
+
+
+def plot_heatmaps(df, bins=(40, 30), sigma=1.5):
+    grids = density_grids(df, bins=bins, sigma=sigma)
+    return {name: draw_density(g, title=f"Heatmap for {name}") for name, g in grids.items() if name != TEAM_KEY}
+
+
+def kde_reference_grid(x, y, bins=(40, 30), extent=CANVAS_EXTENT, bw_adjust=0.5):
+    # Same estimator seaborn's kdeplot uses (gaussian_kde, Scott bandwidth), evaluated at cell centres;
+    # seaborn's vendored copy avoids a scipy dependency
+    from seaborn.external.kde import gaussian_kde
+    nx, ny = bins
+    x0, x1, y0, y1 = extent
+    kde = gaussian_kde(np.vstack([x, y]))
+    kde.set_bandwidth(kde.factor * bw_adjust)
+    cx = x0 + (np.arange(nx) + 0.5) * (x1 - x0) / nx
+    cy = y0 + (np.arange(ny) + 0.5) * (y1 - y0) / ny
+    gx, gy = np.meshgrid(cx, cy)
+    return kde(np.vstack([gx.ravel(), gy.ravel()])).reshape(ny, nx)
+
+
+def compare_to_kde(df, player_name, bins=(40, 30), sigma=1.5):
+    x, y = event_xy(df[df["Player"].astype("string") == str(player_name)])
+    ok = np.isfinite(x) & np.isfinite(y)
+    ref = kde_reference_grid(x[ok], y[ok], bins=bins)
+    grid = density_grid(x[ok], y[ok], bins=bins, sigma=sigma)
+    ref, grid = ref / ref.sum(), grid / grid.sum()
+    return {
+        "correlation": float(np.corrcoef(ref.ravel(), grid.ravel())[0, 1]),
+        "max_abs_error": float(np.abs(ref - grid).max()),
+        "l1_error": float(np.abs(ref - grid).sum()),
+    }
+
+
+def benchmark_heatmaps(df, bins=(40, 30), sigma=1.5):
+    if isinstance(df, IndexedEvents):
+        df = df.df
+    players = list(df["Player"].dropna().unique())
+
+    start = time.perf_counter()
+    for player in players:
+        fig = plot_heatmap(df, player)
+        if fig is not None:
+            plt.close(fig)
+    kde_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    density_grids(df, bins=bins, sigma=sigma)
+    grid_seconds = time.perf_counter() - start
+
+    return {
+        "players": len(players),
+        "events": len(df),
+        "kde_seconds": kde_seconds,
+        "grid_seconds": grid_seconds,
+        "speedup": kde_seconds / grid_seconds if grid_seconds else float("inf"),
+    }
@@ -0,0 +1,136 @@
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+
+# Span timers and counters for the report pipeline; near-free while disabled (SOCCER_TRACE=1 to enable)
+_enabled = os.environ.get("SOCCER_TRACE") == "1"
+_lock = threading.Lock()
+_spans = []
+_stats = {}
+_counters = {}
+MAX_SPANS = 10000
+
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        duration = time.perf_counter() - self.start
+        with _lock:
+            if len(_spans) < MAX_SPANS:
+                _spans.append({"name": self.name, "start": time.time() - duration, "seconds": duration,
+                               "thread": threading.current_thread().name})
+            stat = _stats.setdefault(self.name, {"count": 0, "total": 0.0, "max": 0.0})
+            stat["count"] += 1
+            stat["total"] += duration
+            stat["max"] = max(stat["max"], duration)
+        return False
+
+
+def enable(on=True):
+    global _enabled
+    _enabled = on
+
+
+def is_enabled():
+    return _enabled
+
+
+def span(name):
+    return _Span(name) if _enabled else _NOOP
+
+
+def count(name, amount=1):
+    if _enabled:
+        with _lock:
+            _counters[name] = _counters.get(name, 0) + amount
+
+
+def traced(name):
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def stats():
+    with _lock:
+        return {name: dict(s, mean=s["total"] / s["count"]) for name, s in _stats.items()}, dict(_counters)
+
+
+def reset():
+    with _lock:
+        _spans.clear()
+        _stats.clear()
+        _counters.clear()
+
+
+def to_jsonl():
+    with _lock:
+        return "".join(json.dumps(s) + "\n" for s in _spans)
+
+
+def to_prometheus():
+    stage_stats, counters = stats()
+    lines = ["# TYPE soccer_stage_seconds summary"]
+    for name, s in sorted(stage_stats.items()):
+        lines.append(f'soccer_stage_seconds_sum{{stage="{name}"}} {s["total"]:.6f}')
+        lines.append(f'soccer_stage_seconds_count{{stage="{name}"}} {s["count"]}')
+    lines.append("# TYPE soccer_stage_seconds_max gauge")
+    for name, s in sorted(stage_stats.items()):
+        lines.append(f'soccer_stage_seconds_max{{stage="{name}"}} {s["max"]:.6f}')
+    lines.append("# TYPE soccer_events_total counter")
+    for name, value in sorted(counters.items()):
+        lines.append(f'soccer_events_total{{name="{name}"}} {value}')
+    return "\n".join(lines) + "\n"
+
+
+def export(path):
+    # .prom writes the Prometheus text format, anything else JSON lines
+    with open(path, "w") as f:
+        f.write(to_prometheus() if path.endswith(".prom") else to_jsonl())
+    return path
+
+
+@contextmanager
+def profile(limit=25, sort="cumulative"):
+    # Capture one request under cProfile; the formatted stats land in result["text"] on exit
+    result = {}
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield result
+    finally:
+        profiler.disable()
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats(sort).print_stats(limit)
+        result["text"] = out.getvalue()
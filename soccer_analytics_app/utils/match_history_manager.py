@@ -1,4 +1,160 @@
 import os
+import re
+import sqlite3
+from contextlib import closing
 
-def list_match_reports(report_dir="output/reports"):
-    return [f for f in os.listdir(report_dir) if f.endswith(".pdf") or f.endswith(".pptx")]
+CATALOG_PATH = "output/catalog.sqlite"
+REPORT_EXTENSIONS = (".pdf", ".pptx")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    match_key TEXT PRIMARY KEY,
+    date TEXT,
+    opponent TEXT,
+    venue TEXT,
+    our_score INTEGER,
+    opponent_score INTEGER,
+    xg REAL,
+    opponent_xg REAL,
+    created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_matches_date ON matches (date);
+CREATE INDEX IF NOT EXISTS idx_matches_opponent ON matches (opponent, date);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    dir TEXT,
+    name TEXT,
+    match_key TEXT,
+    size INTEGER,
+    mtime REAL
+);
+CREATE INDEX IF NOT EXISTS idx_files_dir ON files (dir, name);
+CREATE INDEX IF NOT EXISTS idx_files_match ON files (match_key);
+CREATE TABLE IF NOT EXISTS scans (
+    dir TEXT PRIMARY KEY,
+    mtime REAL
+);
+"""
+
+
+def open_catalog(catalog_path=CATALOG_PATH):
+    os.makedirs(os.path.dirname(catalog_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(catalog_path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def match_key(match_data):
+    # Identity of the fixture, not of the submission, so resubmitting a match updates its row
+    return f"{match_data.get('Date', '')}|{match_data.get('Opponent', '')}|{match_data.get('Venue', '')}"
+
+
+def _file_row(path, key):
+    stat = os.stat(path)
+    return (path, os.path.dirname(path), os.path.basename(path), key, stat.st_size, stat.st_mtime)
+
+
+def record_match(match_data, file_paths=(), catalog_path=CATALOG_PATH):
+    key = match_key(match_data)
+    with closing(open_catalog(catalog_path)) as conn, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO matches VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, match_data.get("Date"), match_data.get("Opponent"), match_data.get("Venue"),
+             match_data.get("Our Score"), match_data.get("Opponent Score"),
+             match_data.get("Expected Goals (xG)"), match_data.get("Opponent Expected Goals (xG)"),
+             match_data.get("Timestamp")),
+        )
+        conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)",
+                         [_file_row(p, key) for p in file_paths if os.path.exists(p)])
+    return key
+
+
+def _slug(text):
+    return re.sub(r"[^a-z0-9]+", "", str(text or "").lower())
+
+
+def _guess_match(conn, name):
+    # Files added outside the app are attached by a YYYY-MM-DD date in the name, plus the opponent if it's ambiguous
+    found = re.search(r"\d{4}-\d{2}-\d{2}", name)
+    if not found:
+        return None
+    candidates = conn.execute("SELECT match_key, opponent FROM matches WHERE date = ?", (found.group(),)).fetchall()
+    named = [r for r in candidates if _slug(r["opponent"]) and _slug(r["opponent"]) in _slug(name)]
+    if len(named) == 1:
+        return named[0]["match_key"]
+    return candidates[0]["match_key"] if len(candidates) == 1 else None
+
+
+def rescan_reports(report_dir="output/reports", catalog_path=CATALOG_PATH):
+    # Picks up files added or removed outside the app; skipped entirely while the directory is unchanged
+    if not os.path.isdir(report_dir):
+        return False
+    dir_mtime = os.stat(report_dir).st_mtime
+    with closing(open_catalog(catalog_path)) as conn, conn:
+        row = conn.execute("SELECT mtime FROM scans WHERE dir = ?", (report_dir,)).fetchone()
+        if row is not None and row["mtime"] == dir_mtime:
+            return False
+        known = {r["path"]: (r["size"], r["mtime"])
+                 for r in conn.execute("SELECT path, size, mtime FROM files WHERE dir = ?", (report_dir,))}
+        seen = set()
+        for entry in os.scandir(report_dir):
+            if not entry.is_file() or not entry.name.endswith(REPORT_EXTENSIONS):
+                continue
+            seen.add(entry.path)
+            stat = entry.stat()
+            if known.get(entry.path) != (stat.st_size, stat.st_mtime):
+                conn.execute(
+                    "INSERT INTO files VALUES (?, ?, ?, NULL, ?, ?) "
+                    "ON CONFLICT(path) DO UPDATE SET size = excluded.size, mtime = excluded.mtime",
+                    (entry.path, report_dir, entry.name, stat.st_size, stat.st_mtime),
+                )
+        conn.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in known if p not in seen])
+        unmatched = conn.execute("SELECT path, name FROM files WHERE dir = ? AND match_key IS NULL", (report_dir,))
+        for row in unmatched.fetchall():
+            key = _guess_match(conn, row["name"])
+            if key is not None:
+                conn.execute("UPDATE files SET match_key = ? WHERE path = ?", (key, row["path"]))
+        conn.execute("INSERT OR REPLACE INTO scans VALUES (?, ?)", (report_dir, dir_mtime))
+    return True
+
+
+def list_match_reports(report_dir="output/reports", catalog_path=CATALOG_PATH):
+    rescan_reports(report_dir, catalog_path)
+    with closing(open_catalog(catalog_path)) as conn:
+        rows = conn.execute("SELECT name FROM files WHERE dir = ? ORDER BY name", (report_dir,))
+        return [r["name"] for r in rows if r["name"].endswith(REPORT_EXTENSIONS)]
+
+
+def unmatched_reports(report_dir="output/reports", catalog_path=CATALOG_PATH):
+    rescan_reports(report_dir, catalog_path)
+    with closing(open_catalog(catalog_path)) as conn:
+        rows = conn.execute("SELECT path, name, size, mtime FROM files WHERE dir = ? AND match_key IS NULL "
+                            "ORDER BY mtime DESC", (report_dir,))
+        return [dict(r) for r in rows]
+
+
+def query_matches(opponent=None, venue=None, date_from=None, date_to=None, limit=50, offset=0,
+                  catalog_path=CATALOG_PATH):
+    clauses, params = [], []
+    for column, op, value in (("opponent", "=", opponent), ("venue", "=", venue),
+                              ("date", ">=", date_from), ("date", "<=", date_to)):
+        if value is not None:
+            clauses.append(f"{column} {op} ?")
+            params.append(value)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    sql = (f"SELECT m.*, (SELECT group_concat(path, ';') FROM files f WHERE f.match_key = m.match_key) AS files "
+           f"FROM matches m {where} ORDER BY date DESC, created_at DESC LIMIT ? OFFSET ?")
+    with closing(open_catalog(catalog_path)) as conn:
+        return [dict(r) for r in conn.execute(sql, params + [limit, offset])]
+
+
+def count_matches(opponent=None, venue=None, catalog_path=CATALOG_PATH):
+    clauses, params = [], []
+    for column, value in (("opponent", opponent), ("venue", venue)):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    with closing(open_catalog(catalog_path)) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM matches {where}", params).fetchone()[0]
@@ -0,0 +1,238 @@
+import functools
+import io
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib
+matplotlib.use("Agg")
+import pandas as pd
+from mplsoccer import Pitch
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib import colors
+from utils.heatmap import density_grid, draw_density
+from utils.coordinates import parse_positions
+from utils.render_cache import render_cache
+from utils.match_history_manager import record_match
+from utils.instrumentation import span, traced
+
+TABLE_STYLE = [
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+]
+
+_pitch_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _styles():
+    return getSampleStyleSheet(), TableStyle(TABLE_STYLE)
+
+
+@functools.lru_cache(maxsize=1)
+def _blank_pitch():
+    # Drawn once per process; heatmaps are layered on top and removed after each save
+    pitch = Pitch(pitch_color='grass', line_color='white')
+    fig, ax = pitch.draw()
+    return pitch, fig, ax
+
+
+def _draw_positions(pitch, ax, x, y):
+    extent = (0, pitch.dim.length, 0, pitch.dim.width)
+    grid = density_grid(x, y, bins=(24, 16), extent=extent, sigma=1.5)
+    draw_density(grid, ax=ax, extent=extent, cmap='viridis', alpha=0.5)
+
+# Generate heatmap
+def generate_heatmap(positions):
+    pitch = Pitch(pitch_color='grass', line_color='white')
+    fig, ax = pitch.draw()
+    _, x, y, _ = parse_positions(positions)
+    if len(x):
+        _draw_positions(pitch, ax, x, y)
+    return fig
+
+def _heatmap_png(positions):
+    _, x, y, _ = parse_positions(positions)
+    png = io.BytesIO()
+    with _pitch_lock:
+        pitch, fig, ax = _blank_pitch()
+        # The shared axes go back to their blank state after every render, so output never depends on history
+        layered = len(ax.images)
+        state = (ax.get_aspect(), ax.get_adjustable(), ax.get_xlim(), ax.get_ylim())
+        try:
+            if len(x):
+                with span("heatmap.density"):
+                    _draw_positions(pitch, ax, x, y)
+            with span("heatmap.savefig"):
+                fig.savefig(png, format="png")
+        finally:
+            for image in ax.images[layered:]:
+                image.remove()
+            aspect, adjustable, xlim, ylim = state
+            ax.set_aspect(aspect, adjustable=adjustable)
+            ax.set_xlim(*xlim)
+            ax.set_ylim(*ylim)
+    return png.getvalue()
+
+
+def render_heatmap_png(positions):
+    return render_cache.get_or_render("heatmap", _heatmap_png, positions)
+
+# Generate PDF report
+def render_pdf_report(match_data):
+    return render_cache.get_or_render("match_report", _build_pdf_report, match_data)
+
+
+@traced("report.pdf")
+def _build_pdf_report(match_data):
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    styles, table_style = _styles()
+    elements = []
+
+    elements.append(Paragraph("Match Report", styles['Title']))
+    elements.append(Spacer(1, 12))
+    elements.append(Paragraph(f"Timestamp: {match_data['Timestamp']}", styles['Normal']))
+    elements.append(Paragraph(f"Date: {match_data['Date']}", styles['Normal']))
+    elements.append(Paragraph(f"Opponent: {match_data['Opponent']}", styles['Normal']))
+    elements.append(Paragraph(f"Score: {match_data['Our Score']} - {match_data['Opponent Score']}", styles['Normal']))
+    elements.append(Spacer(1, 12))
+
+    elements.append(Paragraph("Match Summary", styles['Heading2']))
+    elements.append(Paragraph(f"Key Moments: {match_data['Notes']}", styles['Normal']))
+    elements.append(Spacer(1, 12))
+
+    # Calculate success rates
+    tackle_success = (match_data['Tackles Successful'] / match_data['Tackles Attempted'] * 100) if match_data['Tackles Attempted'] > 0 else 0
+    dribble_success = (match_data['Dribbles Successful'] / match_data['Dribbles Attempted'] * 100) if match_data['Dribbles Attempted'] > 0 else 0
+    cross_success = (match_data['Crosses Successful'] / match_data['Crosses Attempted'] * 100) if match_data['Crosses Attempted'] > 0 else 0
+
+    elements.append(Paragraph("Team Performance", styles['Heading2']))
+    team_data = [
+        ["Metric", "Our Team", "Opponent"],
+        ["Possession (%)", f"{match_data['Possession (%)']}", f"{100 - match_data['Possession (%)']}"],
+        ["Shots (On Target/Total)", f"{match_data['Shots on Target']}/{match_data['Shots']}", "-"],
+        ["Passes (Completed/Attempted)", f"{match_data['Passes Completed']}/{match_data['Passes Attempted']}", "-"],
+        ["Pass Completion (%)", f"{match_data['Pass Completion (%)']:.1f}", "-"],
+        ["Tackles (Successful/Attempted)", f"{match_data['Tackles Successful']}/{match_data['Tackles Attempted']}", "-"],
+        ["Tackle Success (%)", f"{tackle_success:.1f}", "-"],
+        ["Dribbles (Successful/Attempted)", f"{match_data['Dribbles Successful']}/{match_data['Dribbles Attempted']}", "-"],
+        ["Dribble Success (%)", f"{dribble_success:.1f}", "-"],
+        ["Crosses (Successful/Attempted)", f"{match_data['Crosses Successful']}/{match_data['Crosses Attempted']}", "-"],
+        ["Cross Success (%)", f"{cross_success:.1f}", "-"],
+        ["Expected Goals (xG)", f"{match_data['Expected Goals (xG)']:.1f}", f"{match_data['Opponent Expected Goals (xG)']:.1f}"],
+        ["Field Tilt (%)", f"{match_data['Field Tilt (%)']}", f"{100 - match_data['Field Tilt (%)']}"],
+        ["PPDA", f"{match_data['PPDA']}", "-"],
+        ["Set Pieces", f"{match_data['Set Piece Outcomes']}", "-"]
+    ]
+    table = Table(team_data)
+    table.setStyle(table_style)
+    elements.append(table)
+    elements.append(Spacer(1, 12))
+
+    elements.append(Paragraph("Player Performance", styles['Heading2']))
+    player_data = [
+        ["Metric", "Value"],
+        ["Goals", match_data['Player Goals']],
+        ["Assists", match_data['Player Assists']],
+        ["Shot-Creating Actions (SCA)", match_data['Shot-Creating Actions (SCA)']],
+        ["Goal-Creating Actions (GCA)", match_data['Goal-Creating Actions (GCA)']],
+        ["Expected Assists (xA)", f"{match_data['Expected Assists (xA)']:.1f}"],
+        ["HMLD (km)", f"{match_data['High Metabolic Load Distance (HMLD)']}"],
+        ["Evaluations", match_data.get('Player Evaluations', '')]
+    ]
+    player_table = Table(player_data)
+    player_table.setStyle(table_style)
+    elements.append(player_table)
+    elements.append(Spacer(1, 12))
+
+    elements.append(Paragraph("Tactical Analysis", styles['Heading2']))
+    elements.append(Paragraph(f"Formation: {match_data['Formation']}", styles['Normal']))
+    elements.append(Paragraph(f"Possession Zones: {match_data['Possession Zones']}", styles['Normal']))
+    elements.append(Paragraph(f"Set Pieces: {match_data['Set Piece Outcomes']}", styles['Normal']))
+    elements.append(Paragraph(f"Key Moments: {match_data['Notes']}", styles['Normal']))
+    elements.append(Spacer(1, 12))
+
+    elements.append(Paragraph("Recommendations", styles['Heading2']))
+    recommendations = f"Adjust pressing (PPDA: {match_data['PPDA']}). Focus on {match_data['Possession Zones']}. Improve tackle success ({tackle_success:.1f}%)."
+    elements.append(Paragraph(recommendations, styles['Normal']))
+    elements.append(Spacer(1, 12))
+
+    # Add heatmap
+    with span("report.heatmap"):
+        heatmap_bytes = render_heatmap_png(match_data.get("Formation Positions", ""))
+    heatmap_png = io.BytesIO(heatmap_bytes)
+    elements.append(Paragraph("Player Heatmap", styles['Heading2']))
+    elements.append(Image(heatmap_png, width=400, height=300))
+
+    with span("report.doc_build"):
+        doc.build(elements)
+    return buffer.getvalue()
+
+
+def generate_pdf_report(match_data, pdf_path=None, output_dir="output/reports"):
+    # Unique file per call so concurrent sessions never overwrite each other's report
+    if pdf_path is None:
+        os.makedirs(output_dir, exist_ok=True)
+        pdf_path = os.path.join(output_dir, f"match_report_{uuid.uuid4().hex}.pdf")
+    with open(pdf_path, "wb") as f:
+        f.write(render_pdf_report(match_data))
+    return pdf_path
+
+
+def load_match_records(csv_paths):
+    records = []
+    for path in csv_paths:
+        df = pd.read_csv(path)
+        records.extend(df.astype(object).where(df.notna(), "").to_dict("records"))
+    return records
+
+
+def _render_record(args):
+    index, match_data, output_dir = args
+    start = time.perf_counter()
+    if output_dir is None:
+        result = {"pdf": render_pdf_report(match_data)}
+    else:
+        name = f"{match_data.get('Date', '')}_{match_data.get('Opponent', '')}_{index}".replace(" ", "_")
+        result = {"path": generate_pdf_report(match_data, os.path.join(output_dir, f"match_report_{name}.pdf"))}
+        record_match(match_data, [result["path"]])
+    result.update({"index": index, "Opponent": match_data.get("Opponent"), "Date": match_data.get("Date"),
+                   "seconds": time.perf_counter() - start})
+    return result
+
+
+def render_reports(match_records, output_dir=None, workers=None):
+    # Returns one result per record, in input order, with bytes (output_dir=None) or the written path
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+    jobs = [(i, record, output_dir) for i, record in enumerate(match_records)]
+    start = time.perf_counter()
+    if workers == 1 or len(jobs) <= 1:
+        results = [_render_record(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_render_record, jobs))
+    return results, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Render match report PDFs for stored match records")
+    parser.add_argument("records", nargs="+", help="match data CSV files")
+    parser.add_argument("--out", default="output/reports/season")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    results, total = render_reports(load_match_records(args.records), args.out, args.workers)
+    for r in results:
+        print(f"{r['Date']} {r['Opponent']}: {r['seconds']:.2f}s -> {r['path']}")
+    print(f"{len(results)} reports in {total:.2f}s")
@@ -1,9 +1,17 @@
+import pandas as pd
+
 # Mock AI-generated match summary
 def generate_summary(events):
     summary = []
-    total_shots = sum(1 for e in events if e["Event Type"] == "Shot")
-    goals = sum(1 for e in events if e["Event Type"] == "Goal")
-    xg_total = sum(e.get("xG", 0) for e in events if e["Event Type"] == "Shot")
+    if isinstance(events, pd.DataFrame):
+        shots = events["Event Type"] == "Shot"
+        total_shots = int(shots.sum())
+        goals = int((events["Event Type"] == "Goal").sum())
+        xg_total = float(events.loc[shots, "xG"].sum()) if "xG" in events.columns else 0.0
+    else:
+        total_shots = sum(1 for e in events if e["Event Type"] == "Shot")
+        goals = sum(1 for e in events if e["Event Type"] == "Goal")
+        xg_total = sum(e.get("xG", 0) for e in events if e["Event Type"] == "Shot")
 
     summary.append(f"Total shots taken: {total_shots}")
     summary.append(f"Goals scored: {goals}")
@@ -1,11 +1,87 @@
+import functools
 import matplotlib.pyplot as plt
 import matplotlib.image as mpimg
+import numpy as np
+import pandas as pd
+from matplotlib.animation import FuncAnimation, PillowWriter
+from utils.coordinates import PITCH_SPACES, event_xy
 
-def plot_event_on_field(event_coords, background='assets/field_overlay.png'):
+EVENT_COLORS = {"Pass": "tab:blue", "Shot": "tab:red", "Goal": "gold", "Tackle": "tab:green"}
+# The background is stretched over the 400x300 canvas space the events are parsed into, whatever its pixel size
+CANVAS_EXTENT = (0, PITCH_SPACES["canvas"][0], PITCH_SPACES["canvas"][1], 0)
+
+
+@functools.lru_cache(maxsize=4)
+def load_background(background='assets/field_overlay.png'):
+    # Decoded once per path; callers share the array, so it is marked read-only
     img = mpimg.imread(background)
+    img.setflags(write=False)
+    return img
+
+def plot_event_on_field(event_coords, background='assets/field_overlay.png'):
+    img = load_background(background)
     fig, ax = plt.subplots()
     ax.imshow(img)
     x, y = event_coords
     ax.plot(x, y, 'ro')  # Mark event
     plt.axis('off')
     return fig
+
+
+def _coords(events):
+    if isinstance(events, np.ndarray):
+        return events[:, 0], events[:, 1], np.array(["Event"] * len(events))
+    df = events if isinstance(events, pd.DataFrame) else pd.DataFrame(events)
+    x, y = event_xy(df)
+    kinds = df["Event Type"].astype(str).to_numpy() if "Event Type" in df.columns else np.array(["Event"] * len(df))
+    return x, y, kinds
+
+
+def _colors(kinds):
+    return [EVENT_COLORS.get(k, "white") for k in kinds]
+
+
+def plot_events_on_field(events, background='assets/field_overlay.png', event_types=None, end_coords=None):
+    # All events in one scatter (and one quiver for pass/carry end points) on a single figure
+    x, y, kinds = _coords(events)
+    keep = np.isfinite(x) & np.isfinite(y)
+    if event_types is not None:
+        keep &= np.isin(kinds, list(event_types))
+    fig, ax = plt.subplots()
+    ax.imshow(load_background(background), extent=CANVAS_EXTENT)
+    ax.scatter(x[keep], y[keep], c=_colors(kinds[keep]), s=18, edgecolors="black", linewidths=0.3)
+    if end_coords is not None:
+        end = np.asarray(end_coords, float)[keep]
+        ax.quiver(x[keep], y[keep], end[:, 0] - x[keep], end[:, 1] - y[keep],
+                  angles="xy", scale_units="xy", scale=1, width=0.003, color="white")
+    ax.axis('off')
+    return fig
+
+
+def animate_events(events, background='assets/field_overlay.png', filename=None, interval=200, trail=10):
+    # Pitch drawn once; blitting redraws only the moving markers each frame
+    df = events if isinstance(events, pd.DataFrame) else pd.DataFrame(events)
+    if "Timestamp" in df.columns:
+        df = df.sort_values("Timestamp", kind="stable")
+    x, y, kinds = _coords(df)
+    keep = np.isfinite(x) & np.isfinite(y)
+    x, y, colors = x[keep], y[keep], np.array(_colors(kinds[keep]))
+    stamps = df["Timestamp"].to_numpy()[keep] if "Timestamp" in df.columns else np.arange(len(x))
+
+    fig, ax = plt.subplots()
+    ax.imshow(load_background(background), extent=CANVAS_EXTENT)
+    ax.axis('off')
+    markers = ax.scatter([], [], s=30, edgecolors="black", linewidths=0.3)
+    label = ax.text(0.02, 0.96, "", transform=ax.transAxes, color="white", fontsize=9, va="top")
+
+    def update(frame):
+        start = max(0, frame - trail + 1)
+        markers.set_offsets(np.column_stack([x[start:frame + 1], y[start:frame + 1]]))
+        markers.set_facecolors(colors[start:frame + 1])
+        label.set_text(f"{stamps[frame]}s")
+        return markers, label
+
+    anim = FuncAnimation(fig, update, frames=len(x), interval=interval, blit=True)
+    if filename:
+        anim.save(filename, writer=PillowWriter(fps=max(1, 1000 // interval)))
+    return anim
@@ -1,4 +1,7 @@
 from fpdf import FPDF
+from utils.render_cache import cached_file_output
+from utils.pdf_table import write_event_table
+from utils.instrumentation import traced
 
 class PDF(FPDF):
     def header(self):
@@ -16,7 +19,13 @@ class PDF(FPDF):
         self.multi_cell(0, 10, body)
         self.ln()
 
-def generate_pdf_report(events, filename="output/reports/match_report.pdf"):
+def generate_pdf_report(events, filename="output/reports/match_report.pdf", use_cache=True):
+    if use_cache:
+        return cached_file_output("pdf_export", _write_pdf_report, filename, events)
+    return _write_pdf_report(events, filename=filename)
+
+@traced("export.pdf")
+def _write_pdf_report(events, filename):
     pdf = PDF()
     pdf.add_page()
     pdf.chapter_title("Event Summary")
@@ -24,3 +33,8 @@ def generate_pdf_report(events, filename="output/reports/match_report.pdf"):
         line = f"{e['Timestamp']}s - {e['Event Type']} by #{e['Player']}: {e['Notes']}"
         pdf.chapter_body(line)
     pdf.output(filename)
+    return filename
+
+def generate_pdf_report_bulk(events, filename="output/reports/match_report.pdf"):
+    # Compact paginated table for full match logs; returns the PDF bytes as well as writing filename
+    return write_event_table(events, "Lulu Analysis Match Report - Event Summary", filename)
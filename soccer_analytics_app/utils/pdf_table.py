@@ -0,0 +1,103 @@
+import time
+from fpdf import FPDF
+from utils.instrumentation import traced
+
+# Compact, paginated event table shared by the bulk modes of pdf_export and scouting_report
+COLUMNS = [("Time", 18), ("Event", 34), ("Player", 16), ("Notes", 122)]
+ROW_HEIGHT = 5
+FONT_SIZE = 8
+ROWS_PER_PAGE = 50
+_PDF_ESCAPE = str.maketrans({"\\": "\\\\", "(": "\\(", ")": "\\)", "\r": "\\r"})
+
+
+class EventTablePDF(FPDF):
+    def __init__(self, title, total_pages=None):
+        super().__init__()
+        self.title_text = title
+        self.total_pages = total_pages
+        self.set_auto_page_break(False)
+
+    def header(self):
+        self.set_font('Arial', 'B', 12)
+        self.cell(0, 8, self.title_text, 0, 1, 'C')
+        self.set_font('Arial', 'B', FONT_SIZE)
+        self.set_fill_color(220, 220, 220)
+        for name, width in COLUMNS:
+            self.cell(width, ROW_HEIGHT + 1, name, 1, 0, 'L', True)
+        self.ln()
+        # Body font is set once per page here, not once per row
+        self.set_font('Arial', '', FONT_SIZE)
+
+    def footer(self):
+        self.set_y(-12)
+        self.set_font('Arial', '', FONT_SIZE)
+        suffix = f" of {self.total_pages}" if self.total_pages else ""
+        self.cell(0, 6, f"Page {self.page_no()}{suffix}", 0, 0, 'C')
+
+
+def _pdf_bytes(pdf):
+    data = pdf.output(dest='S')
+    return data.encode('latin-1') if isinstance(data, str) else bytes(data)
+
+
+def _rows(events):
+    for e in events:
+        yield (f"{e['Timestamp']}s", str(e['Event Type']), f"#{e['Player']}", str(e.get('Notes') or ''))
+
+
+def _text(value, limit=None):
+    if limit and len(value) > limit:
+        value = value[:limit - 3] + "..."
+    return value.encode('latin-1', 'replace').decode('latin-1').translate(_PDF_ESCAPE)
+
+
+def _write_rows(pdf, rows):
+    # One text operator string per row straight into the page stream, the same output FPDF.cell would
+    # produce for left-aligned borderless cells, without its per-call bookkeeping
+    k, font_size = pdf.k, pdf.font_size
+    xs, x = [], pdf.l_margin
+    for _, width in COLUMNS:
+        xs.append(f"{(x + pdf.c_margin) * k:.2f}")
+        x += width
+    # Truncate notes by character count; measuring every string would cost more than drawing it
+    notes_chars = int(COLUMNS[-1][1] / 1.6)
+    y = pdf.y
+    for row in rows:
+        baseline = f"{(pdf.h - (y + 0.5 * ROW_HEIGHT + 0.3 * font_size)) * k:.2f}"
+        texts = [_text(t) for t in row[:-1]] + [_text(row[-1], notes_chars)]
+        pdf._out(" ".join(f"BT {cx} {baseline} Td ({t}) Tj ET" for cx, t in zip(xs, texts) if t))
+        y += ROW_HEIGHT
+    pdf.set_xy(pdf.l_margin, y)
+
+
+@traced("export.pdf_table")
+def render_event_table(events, title, rows_per_page=ROWS_PER_PAGE):
+    total_pages = max(1, -(-len(events) // rows_per_page))
+    pdf = EventTablePDF(title, total_pages)
+    rows = list(_rows(events))
+    for start in range(0, max(len(rows), 1), rows_per_page):
+        pdf.add_page()
+        _write_rows(pdf, rows[start:start + rows_per_page])
+    return _pdf_bytes(pdf)
+
+
+def write_event_table(events, title, filename=None, **render_kwargs):
+    data = render_event_table(events, title, **render_kwargs)
+    if filename:
+        with open(filename, "wb") as f:
+            f.write(data)
+    return data
+
+
+def benchmark_event_table(events, legacy_render=None):
+    results = {"events": len(events)}
+    if legacy_render is not None:
+        start = time.perf_counter()
+        legacy_render(events)
+        results["legacy_seconds"] = time.perf_counter() - start
+    start = time.perf_counter()
+    data = render_event_table(events, "Benchmark")
+    results["bulk_seconds"] = time.perf_counter() - start
+    results["bulk_us_per_event"] = results["bulk_seconds"] / max(len(events), 1) * 1e6
+    results["bulk_bytes"] = len(data)
+    return results
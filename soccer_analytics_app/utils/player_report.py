@@ -1,6 +1,16 @@
 import pandas as pd
+from utils.event_index import IndexedEvents, index_events
 
 def generate_player_report(events_df, player_name):
+    if isinstance(events_df, IndexedEvents):
+        counts = events_df.event_type_counts()
+        if player_name not in counts.index.get_level_values("Player"):
+            return pd.DataFrame({"Event Type": [], "Count": []})
+        return counts.xs(player_name, level="Player").reset_index(name="Count")
     player_events = events_df[events_df["Player"] == player_name]
     summary = player_events.groupby("Event Type").size().reset_index(name="Count")
     return summary
+
+def generate_squad_reports(events_df):
+    indexed = index_events(events_df)
+    return {player: generate_player_report(indexed, player) for player in indexed.players}
@@ -1,14 +1,108 @@
+import copy
+import io
 from pptx import Presentation
-from pptx.util import Inches
+from pptx.util import Inches, Pt
+from utils.render_cache import cached_file_output
+from utils.instrumentation import traced
 
-def generate_powerpoint_summary(events, filename="output/presentations/match_summary.pptx"):
+PHASES = [(0, "First Half"), (2700, "Second Half"), (5400, "Extra Time")]
+COLUMNS = [("Time", 1.0), ("Event", 2.0), ("Player", 1.0), ("Notes", 5.0)]
+
+def generate_powerpoint_summary(events, filename="output/presentations/match_summary.pptx", use_cache=True):
+    if use_cache:
+        return cached_file_output("ppt_export", _write_powerpoint_summary, filename, events)
+    return _write_powerpoint_summary(events, filename=filename)
+
+@traced("export.pptx_summary")
+def _write_powerpoint_summary(events, filename):
     prs = Presentation()
     slide = prs.slides.add_slide(prs.slide_layouts[0])
     title = slide.shapes.title
     title.text = "Match Summary - Lulu Analysis"
 
-    for e in events[:5]:  # Limit to 5 events for preview
+    for i, e in enumerate(events[:5]):  # Limit to 5 events for preview
         content = f"{e['Timestamp']}s - {e['Event Type']} by #{e['Player']} ({e['Notes']})"
-        slide.shapes.add_textbox(Inches(1), Inches(2 + 0.5 * events.index(e)), Inches(8), Inches(0.5)).text = content
+        slide.shapes.add_textbox(Inches(1), Inches(2 + 0.5 * i), Inches(8), Inches(0.5)).text = content
+
+    prs.save(filename)
+    return filename
+
+
+def event_phase(timestamp):
+    name = PHASES[0][1]
+    for start, phase in PHASES:
+        if float(timestamp) >= start:
+            name = phase
+    return name
+
+
+def _table_prototype(prs, layout, rows_per_slide):
+    # Lay the event table out once; every event slide gets a deep copy of its XML
+    scratch = prs.slides.add_slide(layout)
+    shape = scratch.shapes.add_table(rows_per_slide + 1, len(COLUMNS), Inches(0.5), Inches(1.2),
+                                     Inches(9), Inches(0.3 * (rows_per_slide + 1)))
+    table = shape.table
+    for col, (name, width) in enumerate(COLUMNS):
+        table.columns[col].width = Inches(width)
+        table.cell(0, col).text = name
+    for row in range(rows_per_slide + 1):
+        table.rows[row].height = Inches(0.3)
+        for col in range(len(COLUMNS)):
+            for paragraph in table.cell(row, col).text_frame.paragraphs:
+                paragraph.font.size = Pt(10)
+    prototype = copy.deepcopy(shape._element)
+    # Drop the scratch slide again so it does not end up in the deck
+    slide_ids = prs.slides._sldIdLst
+    rel_id = slide_ids[-1].rId
+    slide_ids.remove(slide_ids[-1])
+    prs.part.drop_rel(rel_id)
+    return prototype
+
+
+def _fill_row(table, row, values):
+    for col, value in enumerate(values):
+        text_frame = table.cell(row, col).text_frame
+        run = text_frame.paragraphs[0].runs
+        if run:
+            run[0].text = value
+        else:
+            text_frame.paragraphs[0].add_run().text = value
+            text_frame.paragraphs[0].runs[0].font.size = Pt(10)
+
+
+@traced("export.pptx_deck")
+def generate_powerpoint_deck(events, filename="output/presentations/match_deck.pptx", rows_per_slide=12,
+                             heatmaps=None, template=None):
+    # Whole-match deck: one section per phase, events paginated across slides; heatmaps is {phase: png bytes}
+    prs = Presentation(template) if template else Presentation()
+    title_layout = prs.slide_layouts[0]
+    section_layout = prs.slide_layouts[5]
+    prototype = _table_prototype(prs, section_layout, rows_per_slide)
+
+    slide = prs.slides.add_slide(title_layout)
+    slide.shapes.title.text = "Match Summary - Lulu Analysis"
+    if len(slide.placeholders) > 1:
+        slide.placeholders[1].text = f"{len(events)} tagged events"
+
+    phases = {}
+    for e in sorted(events, key=lambda e: float(e["Timestamp"])):
+        phases.setdefault(event_phase(e["Timestamp"]), []).append(e)
+
+    for phase, phase_events in phases.items():
+        if heatmaps and phase in heatmaps:
+            slide = prs.slides.add_slide(section_layout)
+            slide.shapes.title.text = f"{phase} - Heatmap"
+            slide.shapes.add_picture(io.BytesIO(heatmaps[phase]), Inches(1), Inches(1.5), width=Inches(8))
+        pages = -(-len(phase_events) // rows_per_slide)
+        for page in range(pages):
+            chunk = phase_events[page * rows_per_slide:(page + 1) * rows_per_slide]
+            slide = prs.slides.add_slide(section_layout)
+            slide.shapes.title.text = f"{phase} ({page + 1}/{pages})"
+            slide.shapes._spTree.append(copy.deepcopy(prototype))
+            table = slide.shapes[-1].table
+            for row, e in enumerate(chunk, start=1):
+                _fill_row(table, row, (f"{e['Timestamp']}s", str(e['Event Type']), f"#{e['Player']}",
+                                       str(e.get('Notes') or '')))
 
     prs.save(filename)
+    return filename
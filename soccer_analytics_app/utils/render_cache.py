@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from utils.instrumentation import count
+from collections import OrderedDict
+
+# Content-addressed cache for rendered output (PNG, PDF, PPTX bytes): in-memory LRU that spills
+# evicted entries to a size-capped disk tier
+CACHE_DIR = "output/cache"
+# Bump when any renderer's output changes so stale bytes from the disk tier are never served
+CACHE_VERSION = 3
+
+
+def content_key(kind, *inputs):
+    payload = json.dumps([CACHE_VERSION, kind, inputs], sort_keys=True, default=str)
+    return f"{kind}-{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+
+class RenderCache:
+    def __init__(self, max_bytes=64 * 1024 * 1024, disk_dir=CACHE_DIR, max_disk_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.spills = 0
+        self.bypass = False
+        self._disk_lock = threading.Lock()
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, key)
+
+    def _store(self, key, data):
+        # Returns the evicted entries so the caller can spill them outside the lock
+        if key in self._entries:
+            self._size -= len(self._entries.pop(key))
+        self._entries[key] = data
+        self._size += len(data)
+        evicted = []
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            evicted.append(self._entries.popitem(last=False))
+            self._size -= len(evicted[-1][1])
+            self.evictions += 1
+        return evicted
+
+    def _spill(self, evicted):
+        if not self.disk_dir or not evicted:
+            return
+        with self._disk_lock:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            for key, data in evicted:
+                tmp_path = self._disk_path(key) + ".tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, self._disk_path(key))
+                self.spills += 1
+            self._prune_disk()
+
+    def _prune_disk(self):
+        # Least recently used first: disk hits touch the file's mtime
+        entries = [e for e in os.scandir(self.disk_dir) if e.is_file() and not e.name.endswith(".tmp")]
+        total = sum(e.stat().st_size for e in entries)
+        for entry in sorted(entries, key=lambda e: e.stat().st_mtime):
+            if total <= self.max_disk_bytes:
+                break
+            total -= entry.stat().st_size
+            os.remove(entry.path)
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+        if self.disk_dir:
+            try:
+                with open(self._disk_path(key), "rb") as f:
+                    data = f.read()
+                os.utime(self._disk_path(key))
+            except FileNotFoundError:
+                return None
+            with self._lock:
+                self.disk_hits += 1
+                evicted = self._store(key, data)
+            self._spill(evicted)
+            return data
+        return None
+
+    def put(self, key, data):
+        with self._lock:
+            evicted = self._store(key, data)
+        self._spill(evicted)
+
+    def get_or_render(self, kind, render, *inputs):
+        if self.bypass:
+            return render(*inputs)
+        key = content_key(kind, *inputs)
+        data = self.get(key)
+        count(f"render_cache.{'miss' if data is None else 'hit'}")
+        if data is None:
+            with self._lock:
+                self.misses += 1
+            data = render(*inputs)
+            self.put(key, data)
+        return data
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                    "evictions": self.evictions, "spills": self.spills, "entries": len(self._entries),
+                    "bytes": self._size}
+
+    @contextmanager
+    def bypassed(self):
+        # Renders everything fresh and touches neither tier, e.g. while benchmarking the renderers
+        previous, self.bypass = self.bypass, True
+        try:
+            yield self
+        finally:
+            self.bypass = previous
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+render_cache = RenderCache()
+
+
+def cached_file_output(kind, build, filename, *inputs):
+    # For exporters that write straight to a file: build once, then serve repeats from the cache
+    built = []
+
+    def render(*args):
+        build(*args, filename=filename)
+        built.append(filename)
+        with open(filename, "rb") as f:
+            return f.read()
+
+    data = render_cache.get_or_render(kind, render, *inputs)
+    if not built:
+        with open(filename, "wb") as f:
+            f.write(data)
+    return filename
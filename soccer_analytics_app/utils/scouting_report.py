@@ -1,4 +1,6 @@
 from fpdf import FPDF
+from utils.pdf_table import write_event_table
+from utils.instrumentation import traced
 
 class ScoutingPDF(FPDF):
     def header(self):
@@ -16,6 +18,7 @@ class ScoutingPDF(FPDF):
         self.multi_cell(0, 10, body)
         self.ln()
 
+@traced("export.scouting_pdf")
 def generate_scouting_report(events, filename="output/reports/scouting_report.pdf"):
     pdf = ScoutingPDF()
     pdf.add_page()
@@ -24,3 +27,6 @@ def generate_scouting_report(events, filename="output/reports/scouting_report.pd
         line = f"{e['Timestamp']}s - {e['Event Type']} by #{e['Player']}: {e['Notes']}"
         pdf.section_body(line)
     pdf.output(filename)
+
+def generate_scouting_report_bulk(events, filename="output/reports/scouting_report.pdf"):
+    return write_event_table(events, "Scouting Report - Lulu Analysis - Key Events", filename)
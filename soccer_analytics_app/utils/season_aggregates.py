@@ -0,0 +1,164 @@
+import json
+from contextlib import closing
+from utils.match_history_manager import CATALOG_PATH, match_key, open_catalog
+
+# Running season aggregates, updated once per added match so trend queries never rescan the season
+ROLLING_WINDOW = 5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS season_matches (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    match_key TEXT UNIQUE,
+    record TEXT
+);
+CREATE TABLE IF NOT EXISTS season_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    state TEXT
+);
+"""
+
+
+def empty_state(window=ROLLING_WINDOW):
+    return {
+        "matches": 0, "goals_for": 0, "goals_against": 0, "xg_for": 0.0, "xg_against": 0.0,
+        "passes_completed": 0, "passes_attempted": 0, "ppda_sum": 0.0, "ppda_matches": 0,
+        "rolling": {"window": window, "xg_for": [], "xg_against": [], "sum_for": 0.0, "sum_against": 0.0},
+        "players": {},
+    }
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _names(text):
+    return [name.strip() for name in str(text or "").split(",") if name.strip()]
+
+
+def _minutes(text):
+    minutes = {}
+    for item in _names(text):
+        name, _, value = item.partition(":")
+        minutes[name.strip()] = minutes.get(name.strip(), 0.0) + _number(value)
+    return minutes
+
+
+def _push(rolling, key, value):
+    values = rolling[key]
+    values.append(value)
+    total_key = "sum_for" if key == "xg_for" else "sum_against"
+    rolling[total_key] += value
+    if len(values) > rolling["window"]:
+        rolling[total_key] -= values.pop(0)
+
+
+def apply_match(state, match_data):
+    xg_for = _number(match_data.get("Expected Goals (xG)"))
+    xg_against = _number(match_data.get("Opponent Expected Goals (xG)"))
+    state["matches"] += 1
+    state["goals_for"] += int(_number(match_data.get("Our Score")))
+    state["goals_against"] += int(_number(match_data.get("Opponent Score")))
+    state["xg_for"] += xg_for
+    state["xg_against"] += xg_against
+    state["passes_completed"] += int(_number(match_data.get("Passes Completed")))
+    state["passes_attempted"] += int(_number(match_data.get("Passes Attempted")))
+    if _number(match_data.get("PPDA")) > 0:
+        state["ppda_sum"] += _number(match_data.get("PPDA"))
+        state["ppda_matches"] += 1
+    _push(state["rolling"], "xg_for", xg_for)
+    _push(state["rolling"], "xg_against", xg_against)
+
+    players = state["players"]
+    for name in _names(match_data.get("Player Goals")):
+        players.setdefault(name, {"goals": 0, "minutes": 0.0})["goals"] += 1
+    for name, minutes in _minutes(match_data.get("Player Minutes")).items():
+        players.setdefault(name, {"goals": 0, "minutes": 0.0})["minutes"] += minutes
+    return state
+
+
+def _open(catalog_path):
+    conn = open_catalog(catalog_path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def load_state(catalog_path=CATALOG_PATH):
+    with closing(_open(catalog_path)) as conn:
+        row = conn.execute("SELECT state FROM season_state WHERE id = 1").fetchone()
+    return json.loads(row["state"]) if row else empty_state()
+
+
+def _rebuild(conn, window):
+    state = empty_state(window)
+    for row in conn.execute("SELECT record FROM season_matches ORDER BY seq"):
+        apply_match(state, json.loads(row["record"]))
+    conn.execute("INSERT OR REPLACE INTO season_state (id, state) VALUES (1, ?)", (json.dumps(state),))
+    return state
+
+
+def add_match(match_data, catalog_path=CATALOG_PATH):
+    # Folds a new match into the running totals; re-adding a match replaces its record and rebuilds the totals
+    key = match_key(match_data)
+    record = json.dumps(match_data, default=str)
+    with closing(_open(catalog_path)) as conn, conn:
+        # Take the write lock before reading the state so concurrent sessions can't fold into a stale copy
+        conn.execute("BEGIN IMMEDIATE")
+        existing = conn.execute("SELECT record FROM season_matches WHERE match_key = ?", (key,)).fetchone()
+        row = conn.execute("SELECT state FROM season_state WHERE id = 1").fetchone()
+        state = json.loads(row["state"]) if row else empty_state()
+        if existing is not None:
+            if existing["record"] != record:
+                conn.execute("UPDATE season_matches SET record = ? WHERE match_key = ?", (record, key))
+                _rebuild(conn, state["rolling"]["window"])
+            return False
+        conn.execute("INSERT INTO season_matches (match_key, record) VALUES (?, ?)", (key, record))
+        conn.execute("INSERT OR REPLACE INTO season_state (id, state) VALUES (1, ?)",
+                     (json.dumps(apply_match(state, match_data)),))
+    return True
+
+
+def rebuild(catalog_path=CATALOG_PATH, window=ROLLING_WINDOW):
+    with closing(_open(catalog_path)) as conn, conn:
+        conn.execute("BEGIN IMMEDIATE")
+        return _rebuild(conn, window)
+
+
+def season_trends(state=None, catalog_path=CATALOG_PATH):
+    state = state or load_state(catalog_path)
+    matches = state["matches"]
+    rolling = state["rolling"]
+    recent = len(rolling["xg_for"])
+    return {
+        "Matches": matches,
+        "Goals For": state["goals_for"],
+        "Goals Against": state["goals_against"],
+        "xG For / Match": state["xg_for"] / matches if matches else 0.0,
+        "xG Against / Match": state["xg_against"] / matches if matches else 0.0,
+        f"Rolling xG For (last {rolling['window']})": rolling["sum_for"] / recent if recent else 0.0,
+        f"Rolling xG Against (last {rolling['window']})": rolling["sum_against"] / recent if recent else 0.0,
+        "Pass Completion (%)": (100 * state["passes_completed"] / state["passes_attempted"]
+                                if state["passes_attempted"] else 0.0),
+        "PPDA": state["ppda_sum"] / state["ppda_matches"] if state["ppda_matches"] else 0.0,
+    }
+
+
+def player_totals(state=None, catalog_path=CATALOG_PATH):
+    state = state or load_state(catalog_path)
+    return {
+        name: dict(totals, goals_per_90=totals["goals"] * 90 / totals["minutes"] if totals["minutes"] else 0.0)
+        for name, totals in state["players"].items()
+    }
+
+
+def season_focus(state=None, catalog_path=CATALOG_PATH):
+    # Per-match averages in the shape recommend_focus expects
+    from utils.training_focus_ai import recommend_focus
+    state = state or load_state(catalog_path)
+    trends = season_trends(state)
+    matches = max(state["matches"], 1)
+    stats = {"xG": trends["xG For / Match"], "Goals": state["goals_for"] / matches,
+             "Pass %": trends["Pass Completion (%)"]}
+    return recommend_focus(stats)
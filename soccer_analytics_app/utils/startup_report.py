@@ -0,0 +1,91 @@
+import ast
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Measures what app.py pays at startup: module import cost and first-load vs rerun script time
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Top-level imports app.py used to make on every cold start
+BASELINE_IMPORTS = [
+    "streamlit", "pandas", "plotly.express", "mplsoccer", "matplotlib.pyplot", "seaborn",
+    "reportlab.lib.pagesizes", "reportlab.platypus", "reportlab.lib.styles", "reportlab.lib",
+    "smtplib", "email.mime.text", "email.mime.multipart", "email.mime.application", "io", "numpy",
+]
+
+
+def current_imports(script="app.py"):
+    # Module-level imports read from app.py itself, so the list can't drift from the app
+    with open(os.path.join(APP_DIR, script)) as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def import_seconds(modules):
+    # Fresh interpreter each time so nothing is already in sys.modules
+    code = ("import time, importlib; t = time.perf_counter()\n"
+            f"for m in {modules!r}: importlib.import_module(m)\n"
+            "print(time.perf_counter() - t)")
+    out = subprocess.run([sys.executable, "-c", code], cwd=APP_DIR, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def _time_app(reruns, script):
+    from streamlit.testing.v1 import AppTest
+    app = AppTest.from_file(os.path.join(APP_DIR, script), default_timeout=60)
+    start = time.perf_counter()
+    app.run()
+    first = time.perf_counter() - start
+    times = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        app.run()
+        times.append(time.perf_counter() - start)
+    return first, sum(times) / len(times)
+
+
+def app_run_seconds(reruns=3, script="app.py"):
+    # Also a fresh interpreter, so one script's imports never make the other's first load look cheap
+    code = ("import json; from utils.startup_report import _time_app\n"
+            f"print(json.dumps(_time_app({reruns!r}, {script!r})))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=APP_DIR, capture_output=True, text=True, check=True)
+    return tuple(json.loads(out.stdout.strip().splitlines()[-1]))
+
+
+def write_baseline_script(script="app.py", name="_startup_baseline.py"):
+    # The current app with the old eager imports in front: the "before" side of the first-load comparison
+    with open(os.path.join(APP_DIR, script)) as f:
+        source = f.read()
+    path = os.path.join(APP_DIR, name)
+    with open(path, "w") as f:
+        f.write("".join(f"import {m}\n" for m in BASELINE_IMPORTS) + source)
+    return name
+
+
+def startup_report(reruns=3):
+    report = {
+        "baseline_import_seconds": import_seconds(BASELINE_IMPORTS),
+        "current_import_seconds": import_seconds(current_imports()),
+    }
+    baseline_script = write_baseline_script()
+    try:
+        report["baseline_first_load_seconds"], report["baseline_rerun_seconds"] = app_run_seconds(
+            reruns, baseline_script)
+        report["first_load_seconds"], report["rerun_seconds"] = app_run_seconds(reruns)
+    except subprocess.CalledProcessError:
+        pass
+    finally:
+        os.remove(os.path.join(APP_DIR, baseline_script))
+    return report
+
+
+if __name__ == "__main__":
+    print(json.dumps(startup_report(), indent=2))
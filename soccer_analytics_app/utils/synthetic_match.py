@@ -0,0 +1,78 @@
+import numpy as np
+from utils.tagging import create_event
+from utils.coordinates import convert
+
+# Deterministic synthetic matches in the tagged-event schema, for benchmarks and demos
+# At the default 1,800 events this gives about 11 non-scoring shots and 1.4 goals per match
+EVENT_MIX = {"Pass": 0.643, "Carry": 0.10, "Dribble": 0.05, "Cross": 0.03, "Tackle": 0.08,
+             "Interception": 0.06, "Foul": 0.03, "Shot": 0.0062, "Goal": 0.0008}
+NOTES = {"Pass": "Short pass", "Carry": "Progressive carry", "Dribble": "Take-on", "Cross": "Cross into box",
+         "Tackle": "Ground tackle", "Interception": "Read the pass", "Foul": "Foul committed",
+         "Shot": "Shot on goal", "Goal": "Finished"}
+# Rough average positions on the 400x300 canvas for a 4-4-2, attacking towards x = 400
+ROLE_POSITIONS = [(30, 150), (110, 40), (100, 115), (100, 185), (110, 260), (200, 40), (190, 120),
+                  (190, 180), (200, 260), (300, 120), (300, 180)]
+
+
+def generate_match(seed=0, events_per_match=1800, players=14, duration=5400):
+    rng = np.random.default_rng(seed)
+    kinds = rng.choice(list(EVENT_MIX), size=events_per_match, p=list(EVENT_MIX.values()))
+    timestamps = np.sort(rng.uniform(0, duration, events_per_match)).round(1)
+
+    squad = [str(n) for n in range(1, players + 1)]
+    # Starters take most touches; substitutes share the remainder
+    weights = np.array([1.0] * min(players, 11) + [0.3] * max(players - 11, 0))
+    player_idx = rng.choice(players, size=events_per_match, p=weights / weights.sum())
+
+    home = np.array([ROLE_POSITIONS[i % len(ROLE_POSITIONS)] for i in range(players)], dtype=float)
+    x = rng.normal(home[player_idx, 0], 45)
+    y = rng.normal(home[player_idx, 1], 35)
+    shooting = np.isin(kinds, ["Shot", "Goal"])
+    x[shooting] = rng.normal(345, 25, shooting.sum())
+    y[shooting] = rng.normal(150, 30, shooting.sum())
+    x = np.clip(x, 0, 399).astype(int)
+    y = np.clip(y, 0, 299).astype(int)
+
+    return [
+        create_event(kind, float(ts), squad[p], f"{px},{py}", NOTES[kind])
+        for kind, ts, p, px, py in zip(kinds, timestamps, player_idx, x, y)
+    ]
+
+
+def generate_season(matches=38, seed=0, **match_kwargs):
+    return {f"match_{i + 1:02d}": generate_match(seed * 1000 + i, **match_kwargs) for i in range(matches)}
+
+
+def generate_match_record(seed=0, events=None):
+    # A match_data dict in the shape app.py builds from the form, derived from the synthetic events
+    rng = np.random.default_rng(seed)
+    events = events if events is not None else generate_match(seed)
+    count = lambda kind: sum(1 for e in events if e["Event Type"] == kind)
+    shots, goals, passes = count("Shot") + count("Goal"), count("Goal"), count("Pass")
+    completed = int(passes * rng.uniform(0.7, 0.9))
+    scorers = [e["Player"] for e in events if e["Event Type"] == "Goal"]
+    role_x, role_y = convert(*np.array(ROLE_POSITIONS, dtype=float).T, "canvas", "statsbomb")
+    return {
+        "Timestamp": f"2025-01-{seed % 28 + 1:02d} 18:00:00", "Date": f"2025-01-{seed % 28 + 1:02d}",
+        "Opponent": f"Opponent {seed}", "Venue": "Home" if seed % 2 == 0 else "Away",
+        "Formation": "4-4-2", "Weather": "Sunny",
+        "Our Score": goals, "Opponent Score": int(rng.integers(0, 4)),
+        "Possession (%)": int(rng.integers(35, 66)), "Shots": shots, "Shots on Target": int(shots * 0.4),
+        "Passes Attempted": passes, "Passes Completed": completed,
+        "Pass Completion (%)": completed / passes * 100 if passes else 0,
+        "Tackles Successful": int(count("Tackle") * 0.6), "Tackles Attempted": count("Tackle"),
+        "Dribbles Successful": int(count("Dribble") * 0.5), "Dribbles Attempted": count("Dribble"),
+        "Crosses Successful": int(count("Cross") * 0.3), "Crosses Attempted": count("Cross"),
+        "Expected Goals (xG)": round(float(rng.uniform(0.5, 2.5)), 2),
+        "Opponent Expected Goals (xG)": round(float(rng.uniform(0.3, 2.0)), 2),
+        "Expected Assists (xA)": round(float(rng.uniform(0.2, 1.5)), 2),
+        "Expected Threat (xT)": round(float(rng.uniform(0.5, 3.0)), 2),
+        "Field Tilt (%)": int(rng.integers(30, 70)), "PPDA": round(float(rng.uniform(6, 16)), 1),
+        "Possession Zones": "Defensive:30%, Midfield:45%, Attacking:25%",
+        "Set Piece Outcomes": "Corner:Shot", "Notes": "Synthetic match",
+        "High Metabolic Load Distance (HMLD)": round(float(rng.uniform(0.8, 1.6)), 2),
+        "Shot-Creating Actions (SCA)": shots * 2, "Goal-Creating Actions (GCA)": goals * 2,
+        "Player Goals": ", ".join(scorers), "Player Assists": "", "Player Minutes": "9:90, 10:90, 11:75",
+        "Formation Positions": ";".join(f"{i + 1}:{px:.0f},{py:.0f}" for i, (px, py) in enumerate(zip(role_x, role_y))),
+        "Player Evaluations": "",
+    }
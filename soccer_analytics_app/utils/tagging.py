@@ -9,6 +9,12 @@ def create_event(event_type, timestamp, player=None, location=None, notes=None):
         "Notes": notes
     }
 
-def save_events(event_list, filepath="output/reports/tagged_events.csv"):
+def save_events(event_list, filepath="output/reports/tagged_events.csv", match_id=None):
+    if match_id is not None:
+        from utils.event_store import write_match_events
+        return write_match_events(event_list, match_id)
     df = pd.DataFrame(event_list)
     df.to_csv(filepath, index=False)
+
+def append_event(journal, event_type, timestamp, player=None, location=None, notes=None):
+    return journal.append(create_event(event_type, timestamp, player, location, notes))
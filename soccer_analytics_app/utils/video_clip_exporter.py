@@ -1,7 +1,94 @@
 from moviepy.video.io.VideoFileClip import VideoFileClip
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import os
+import subprocess
+import time
 
 def export_clip(video_path, start_time, end_time, output_path):
     with VideoFileClip(video_path) as video:
         clip = video.subclip(start_time, end_time)
         clip.write_videofile(output_path, codec="libx264")
+
+
+def windows_from_events(events, pre=5.0, post=5.0):
+    windows = []
+    for e in events:
+        ts = float(e["Timestamp"])
+        name = f"{int(ts)}s_{e['Event Type']}_{e.get('Player') or 'team'}".replace(" ", "_")
+        windows.append((max(0.0, ts - pre), ts + post, name))
+    return windows
+
+
+def merge_windows(windows):
+    # Overlapping windows become one clip named after its first event plus a count;
+    # the names of every event in each clip are returned alongside
+    merged, members = [], []
+    for start, end, name in sorted(windows):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+            members[-1].append(name)
+        else:
+            merged.append([start, end, name])
+            members.append([name])
+    windows = [(start, end, name if len(names) == 1 else f"{name}+{len(names) - 1}")
+               for (start, end, name), names in zip(merged, members)]
+    return windows, members
+
+
+def _encode_windows(video_path, windows, output_dir):
+    # Each worker opens the source once and cuts all of its windows from that handle
+    paths = []
+    with VideoFileClip(video_path) as video:
+        for start, end, name in windows:
+            path = os.path.join(output_dir, f"{name}.mp4")
+            video.subclip(start, min(end, video.duration)).write_videofile(
+                path, codec="libx264", audio_codec="aac", preset="veryfast", logger=None)
+            paths.append(path)
+    return paths
+
+
+def _ffmpeg_exe():
+    from imageio_ffmpeg import get_ffmpeg_exe
+    return get_ffmpeg_exe()
+
+
+def _copy_window(ffmpeg, video_path, window, output_dir):
+    start, end, name = window
+    ext = os.path.splitext(video_path)[1] or ".mp4"
+    path = os.path.join(output_dir, f"{name}{ext}")
+    # Seeking before -i snaps to the previous keyframe; -c copy skips decoding entirely
+    subprocess.run([ffmpeg, "-y", "-loglevel", "error", "-ss", f"{start:.3f}", "-i", video_path,
+                    "-t", f"{end - start:.3f}", "-c", "copy", "-avoid_negative_ts", "make_zero", path],
+                   check=True)
+    return path
+
+
+def export_clips(video_path, windows, output_dir="output/clips", workers=4, stream_copy=False, merge=True):
+    os.makedirs(output_dir, exist_ok=True)
+    if merge:
+        windows, members = merge_windows(windows)
+    else:
+        members = [[name] for _, _, name in windows]
+    start = time.perf_counter()
+    if stream_copy:
+        ffmpeg = _ffmpeg_exe()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            paths = list(pool.map(lambda w: _copy_window(ffmpeg, video_path, w, output_dir), windows))
+    else:
+        groups = [list(range(i, len(windows), workers)) for i in range(min(workers, len(windows)))]
+        jobs = [[windows[i] for i in group] for group in groups]
+        if len(jobs) <= 1:
+            results = [_encode_windows(video_path, job, output_dir) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+                results = list(pool.map(_encode_windows, [video_path] * len(jobs), jobs, [output_dir] * len(jobs)))
+        paths = [None] * len(windows)
+        for group, group_paths in zip(groups, results):
+            for i, path in zip(group, group_paths):
+                paths[i] = path
+    return {"clips": paths, "events": members, "windows": len(windows), "mode": "copy" if stream_copy else "encode",
+            "seconds": time.perf_counter() - start}
+
+
+def export_event_clips(video_path, events, pre=5.0, post=5.0, **export_kwargs):
+    return export_clips(video_path, windows_from_events(events, pre, post), **export_kwargs)
@@ -1,6 +1,127 @@
+import re
+import wave
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+import numpy as np
+from utils.tagging import create_event
+
+CALLOUT_PATTERN = re.compile(
+    r"\b(shot|goal|pass|tackle|foul|corner|cross|save|interception|dribble|offside)\b"
+    r"\s+(?:by\s+)?(?:number\s+|#)?(\d{1,2})\b",
+    re.IGNORECASE,
+)
+
 # Mock Whisper voice-to-tag system
-def detect_voice_tags(audio_path):
+def detect_voice_tags(audio_path, backend=None, **stream_kwargs):
+    if backend is not None:
+        return sorted(stream_voice_tags(audio_path, backend, **stream_kwargs), key=lambda e: e["Timestamp"])
     # In reality, run Whisper on audio to extract events
     return [
         {"Event Type": "Shot", "Timestamp": 45, "Player": "11", "Location": "210,140", "Notes": "Called: Shot by 11"}
     ]
+
+
+class StubTranscriber:
+    # Local stand-in for Whisper: returns the scripted (seconds, text) phrases that fall inside each segment
+    def __init__(self, script):
+        self.script = sorted(script)
+
+    def transcribe(self, samples, sample_rate, offset):
+        end = offset + len(samples) / sample_rate
+        return [(t - offset, text) for t, text in self.script if offset <= t < end]
+
+
+def _to_mono_float(raw, channels, width):
+    dtype = {1: np.uint8, 2: np.int16, 4: np.int32}[width]
+    samples = np.frombuffer(raw, dtype=dtype).astype(np.float32)
+    if width == 1:
+        samples -= 128.0
+    samples /= float(np.iinfo(dtype).max)
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples
+
+
+def iter_wav_blocks(audio_path, block_seconds=30.0):
+    # Reads block_seconds at a time, so memory stays flat however long the match recording is
+    with wave.open(audio_path, "rb") as wav:
+        rate, channels, width = wav.getframerate(), wav.getnchannels(), wav.getsampwidth()
+        block = max(1, int(rate * block_seconds))
+        while True:
+            raw = wav.readframes(block)
+            if not raw:
+                return
+            yield _to_mono_float(raw, channels, width), rate
+
+
+def load_wav(audio_path):
+    blocks = list(iter_wav_blocks(audio_path))
+    rate = blocks[0][1] if blocks else 0
+    return (np.concatenate([b for b, _ in blocks]) if blocks else np.zeros(0, np.float32)), rate
+
+
+def iter_segments(audio_path, block_seconds=30.0, **split_kwargs):
+    # Yields (offset seconds, samples, rate) per speech segment while reading; the open tail of each block
+    # is carried into the next one so a segment is never cut at a block boundary
+    carry, carry_start, rate = np.zeros(0, np.float32), 0, None
+    for block, rate in iter_wav_blocks(audio_path, block_seconds):
+        buffer = np.concatenate((carry, block))
+        segments = split_on_silence(buffer, rate, **split_kwargs)
+        for s, e in segments[:-1]:
+            yield (carry_start + s) / rate, buffer[s:e], rate
+        tail = segments[-1][0] if segments else len(buffer)
+        carry, carry_start = buffer[tail:], carry_start + tail
+    if rate and len(carry):
+        yield carry_start / rate, carry, rate
+
+
+def split_on_silence(samples, sample_rate, frame_ms=30, silence_db=-40.0, min_silence=0.5, max_segment=60.0):
+    # Returns (start, end) sample ranges cut in the middle of long enough silences
+    frame = max(1, int(sample_rate * frame_ms / 1000))
+    n_frames = len(samples) // frame
+    if n_frames == 0:
+        return [(0, len(samples))] if len(samples) else []
+    rms = np.sqrt(np.mean(samples[:n_frames * frame].reshape(n_frames, frame) ** 2, axis=1))
+    silent = 20 * np.log10(rms + 1e-10) < silence_db
+
+    edges = np.diff(np.concatenate(([0], silent.astype(np.int8), [0])))
+    run_starts, run_ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    min_frames = int(min_silence * 1000 / frame_ms)
+    cuts = [((s + e) // 2) * frame for s, e in zip(run_starts, run_ends) if e - s >= min_frames]
+
+    bounds = [0] + cuts + [len(samples)]
+    max_len = int(max_segment * sample_rate)
+    segments = []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        for s in range(start, end, max_len):
+            segments.append((s, min(s + max_len, end)))
+    return [(s, e) for s, e in segments if e > s]
+
+
+def parse_callouts(text, timestamp):
+    events = []
+    for match in CALLOUT_PATTERN.finditer(text):
+        kind, number = match.groups()
+        events.append(create_event(kind.capitalize(), round(timestamp, 2), number, None, f"Called: {match.group(0)}"))
+    return events
+
+
+def _transcribe_segment(backend, samples, sample_rate, offset):
+    events = []
+    for phrase_time, text in backend.transcribe(samples, sample_rate, offset):
+        events.extend(parse_callouts(text, offset + phrase_time))
+    return events
+
+
+def stream_voice_tags(audio_path, backend, workers=4, block_seconds=30.0, **split_kwargs):
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        # Segments are submitted as they are found; at most 2 x workers are held in memory at once
+        for offset, samples, rate in iter_segments(audio_path, block_seconds, **split_kwargs):
+            pending.add(pool.submit(_transcribe_segment, backend, samples, rate, offset))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        # Yield each segment's events as soon as it is transcribed, not once the whole file is done
+        for future in as_completed(pending):
+            yield from future.result()
@@ -1,3 +1,15 @@
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+from utils.coordinates import PITCH_SPACES, event_xy
+
+COEFFICIENTS_PATH = "models/xg_coefficients.json"
+DEFAULT_COEFFICIENTS = {"intercept": -1.25, "distance": -0.105, "angle": 1.55,
+                        "pitch_length_m": 105.0, "pitch_width_m": 68.0, "goal_width_m": 7.32}
+CANVAS = PITCH_SPACES["canvas"]
+
 # Mock xG model function
 def calculate_xg(event):
     if event['Event Type'] == 'Shot':
@@ -7,3 +19,72 @@ def calculate_xg(event):
         else:
             return 0.1
     return 0
+
+
+def load_coefficients(path=COEFFICIENTS_PATH):
+    coefficients = dict(DEFAULT_COEFFICIENTS)
+    if os.path.exists(path):
+        with open(path) as f:
+            coefficients.update(json.load(f))
+    return coefficients
+
+
+def shot_features(x, y, coefficients=DEFAULT_COEFFICIENTS, canvas=CANVAS):
+    # Canvas coordinates, attacking the goal at x = canvas width; returns distance (m) and goal-mouth angle (rad)
+    dx = (canvas[0] - np.asarray(x, np.float64)) * coefficients["pitch_length_m"] / canvas[0]
+    dy = (np.asarray(y, np.float64) - canvas[1] / 2) * coefficients["pitch_width_m"] / canvas[1]
+    distance = np.hypot(dx, dy)
+    half = coefficients["goal_width_m"] / 2
+    angle = np.abs(np.arctan2(dy + half, dx) - np.arctan2(dy - half, dx))
+    return distance, angle
+
+
+def score_shots(x, y, coefficients=None):
+    coefficients = coefficients or load_coefficients()
+    distance, angle = shot_features(x, y, coefficients)
+    logit = coefficients["intercept"] + coefficients["distance"] * distance + coefficients["angle"] * angle
+    return 1.0 / (1.0 + np.exp(-logit))
+
+
+def xg_batch(events_df, coefficients=None):
+    xg = np.zeros(len(events_df))
+    is_shot = (events_df["Event Type"] == "Shot").to_numpy(bool)
+    if not is_shot.any():
+        return pd.Series(xg, index=events_df.index, name="xG")
+    # Only shot rows need coordinates, so only those get parsed
+    shots = events_df[is_shot]
+    x, y = event_xy(shots)
+    has_xy = np.isfinite(x) & np.isfinite(y)
+
+    shot_xg = np.empty(len(shots))
+    shot_xg[has_xy] = score_shots(x[has_xy], y[has_xy], coefficients)
+    # Shots without coordinates fall back to the rule-based values from calculate_xg
+    if not has_xy.all():
+        in_box = shots["Location"].astype("string").str.contains("box", case=False, na=False).to_numpy(bool)
+        shot_xg[~has_xy] = np.where(in_box[~has_xy], 0.3, 0.1)
+    xg[is_shot] = shot_xg
+    return pd.Series(xg, index=events_df.index, name="xG")
+
+
+def add_xg_column(events_df, coefficients=None):
+    return events_df.assign(xG=xg_batch(events_df, coefficients))
+
+
+def benchmark_xg(events_df, coefficients=None):
+    records = events_df.to_dict("records")
+    for r in records:
+        r["Location"] = r.get("Location") if isinstance(r.get("Location"), str) else ""
+
+    start = time.perf_counter()
+    [calculate_xg(e) for e in records]
+    per_dict = time.perf_counter() - start
+
+    coefficients = coefficients or load_coefficients()
+    start = time.perf_counter()
+    xg_batch(events_df, coefficients)
+    batch = time.perf_counter() - start
+
+    return {"events": len(events_df),
+            "per_dict_events_per_sec": len(records) / per_dict if per_dict else float("inf"),
+            "batch_events_per_sec": len(events_df) / batch if batch else float("inf"),
+            "speedup": per_dict / batch if batch else float("inf")}